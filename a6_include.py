@@ -5,6 +5,8 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+import bisect
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
@@ -103,11 +105,18 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # Slots drop the per-instance __dict__, which is most of the memory of a node
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        The hash of the key is cached so the map never has to recompute it.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +128,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -141,9 +152,11 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, insert_node, setdefault, remove, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,12 +181,34 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
+        self._size += 1
+
+    def setdefault(self, key: str, default: object, hash: int = None) -> (SLNode, bool):
+        """
+        Return the node with matching key, inserting a new node holding default at the front if there is none,
+        walking the list only once.
+        Return the node together with True if it was inserted, False if it already existed.
+        """
+        node = self._head
+        while node:
+            if (hash is None or node.hash == hash) and node.key == key:
+                return node, False
+            node = node.next
+
+        self._head = SLNode(key, default, self._head, hash)
+        self._size += 1
+        return self._head, True
+
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list."""
+        node.next = self._head
+        self._head = node
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
         Return True if removal was successful, False otherwise.
@@ -181,7 +216,7 @@ class LinkedList:
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -192,11 +227,21 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        When a hash is given, nodes with a different cached hash are skipped without comparing keys.
+        """
         node = self._head
+        if hash is None:
+            while node:
+                if node.key == key:
+                    return node
+                node = node.next
+            return node
+
         while node:
-            if node.key == key:
+            if node.hash == hash and node.key == key:
                 return node
             node = node.next
         return node
@@ -206,14 +251,99 @@ class LinkedList:
         return self._size
 
 
+class SortedBucket:
+    """
+    Bucket for a long chain in a hash map. The nodes are kept in a list sorted by (hash, key), so a key is found
+    by binary search instead of a walk. Every node must carry the cached hash of its key.
+    Supported methods are the ones a hash map calls on a LinkedList bucket: insert_node, setdefault, remove,
+    contains, length, iterator
+    """
+
+    __slots__ = ('_order', '_nodes')
+
+    def __init__(self, nodes=()) -> None:
+        """
+        Initialize a bucket holding the given nodes;
+        keeps a list of (hash, key) pairs in step with the sorted nodes to search.
+        """
+        self._nodes = sorted(nodes, key=lambda node: (node.hash, node.key))
+        self._order = [(node.hash, node.key) for node in self._nodes]
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'Sorted [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes, in (hash, key) order."""
+        return iter(self._nodes)
+
+    def _search(self, key: str, hash: int) -> (int, bool):
+        """
+        Return the position of (hash, key) in the sorted order,
+        and whether a node with matching key is already there.
+        """
+        position = bisect.bisect_left(self._order, (hash, key))
+        return position, position < len(self._order) and self._order[position] == (hash, key)
+
+    def setdefault(self, key: str, default: object, hash: int) -> (SLNode, bool):
+        """
+        Return the node with matching key, inserting a new node holding default if there is none.
+        Return the node together with True if it was inserted, False if it already existed.
+        """
+        position, found = self._search(key, hash)
+        if found:
+            return self._nodes[position], False
+
+        node = SLNode(key, default, None, hash)
+        self._order.insert(position, (hash, key))
+        self._nodes.insert(position, node)
+        return node, True
+
+    def insert_node(self, node: SLNode) -> None:
+        """Place an existing node in its sorted position."""
+        position, _ = self._search(node.key, node.hash)
+        node.next = None
+        self._order.insert(position, (node.hash, node.key))
+        self._nodes.insert(position, node)
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        position, found = self._search(key, hash)
+        if not found:
+            return False
+
+        del self._order[position]
+        del self._nodes[position]
+        return True
+
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None if no match."""
+        position, found = self._search(key, hash)
+        return self._nodes[position] if found else None
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    # Slots drop the per-instance __dict__, which is most of the memory of an entry
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        The hash of the key is cached so the map never has to recompute it.
+        """
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -221,3 +351,50 @@ class HashEntry:
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+class EntryIterator:
+    """
+    Separate iterator class for hash maps that store one HashEntry per bucket in a DynamicArray. Each iterator keeps
+    its own position, so several can walk the same map at once. The map must bump its _version whenever entries are
+    added, removed or moved; doing so while an iterator is in use makes it raise RuntimeError.
+    """
+
+    __slots__ = ('_map', '_buckets', '_index', '_version', '_view')
+
+    def __init__(self, hash_map, view: str) -> None:
+        """
+        Initialize the iterator at the first bucket of a map;
+        view selects what is yielded: 'entries', 'keys', 'values' or 'items'.
+        """
+        self._map = hash_map
+        self._buckets = hash_map._buckets._data
+        self._index = 0
+        self._version = hash_map._version
+        self._view = view
+
+    def __iter__(self) -> "EntryIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> object:
+        """Skip empty buckets and tombstones, then return the next live entry in the selected view."""
+        if self._map._version != self._version:
+            raise RuntimeError("HashMap changed during iteration")
+
+        buckets = self._buckets
+        while self._index < len(buckets):
+            entry = buckets[self._index]
+            self._index += 1
+            if entry is None or entry.is_tombstone:
+                continue
+
+            if self._view == 'keys':
+                return entry.key
+            if self._view == 'values':
+                return entry.value
+            if self._view == 'items':
+                return entry.key, entry.value
+            return entry
+
+        raise StopIteration
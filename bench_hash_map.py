@@ -0,0 +1,875 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: Timing benchmarks for the Separate Chaining, Open Addressing and alternative HashMap implementations.
+# Run this file directly to print the results of every benchmark.
+
+import gc
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+import a6_include
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+import capacity_policy
+import hash_functions
+import hash_map_concurrent
+import hash_map_cuckoo
+import hash_map_oa
+import hash_map_rh
+import hash_map_sc
+import hash_map_sharded
+import hash_map_swiss
+import hash_vectorized
+
+
+def _time_per_call(function, keys) -> float:
+    """
+    Times a single-argument function over a sequence of keys
+
+    :param function: A callable taking one key
+    :param keys: A list of keys to pass to the function
+
+    :return: A float representing the average time per call in microseconds
+    """
+    start = time.perf_counter()
+    for key in keys:
+        function(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def bench_oa_miss_latency(entries: int = 1000, lookups: int = 2000) -> None:
+    """
+    Shows that a failed lookup in the Open Addressing HashMap costs the length of the probe sequence
+    rather than the capacity of the table
+
+    :param entries: An integer representing the number of keys stored in every table
+    :param lookups: An integer representing the number of missing keys to look up
+
+    :return: None
+    """
+    print("\nOA - miss latency vs capacity")
+    print("-----------------------------")
+    missing = ['missing' + str(i) for i in range(lookups)]
+    for capacity in (1_009, 10_007, 100_003, 1_000_003):
+        m = hash_map_oa.HashMap(capacity, hash_function_2)
+        for i in range(entries):
+            m.put('key' + str(i), i)
+        get_us = _time_per_call(m.get, missing)
+        contains_us = _time_per_call(m.contains_key, missing)
+        remove_us = _time_per_call(m.remove, missing)
+        print(f"capacity {capacity:>9}: get {get_us:6.2f} us  contains_key {contains_us:6.2f} us  "
+              f"remove {remove_us:6.2f} us")
+
+
+def bench_oa_churn(live_keys: int = 1000, rounds: int = 50) -> None:
+    """
+    Replaces the whole key set of an Open Addressing HashMap over and over, reporting how tombstones and
+    compactions keep the table and the miss latency steady
+
+    :param live_keys: An integer representing the number of keys alive at any time
+    :param rounds: An integer representing the number of times the key set is replaced
+
+    :return: None
+    """
+    print("\nOA - put/remove churn")
+    print("---------------------")
+    m = hash_map_oa.HashMap(2 * live_keys + 1, hash_function_2)
+    missing = ['missing' + str(i) for i in range(live_keys)]
+    for r in range(rounds):
+        for i in range(live_keys):
+            m.put('r' + str(r) + 'k' + str(i), i)
+        if r > 0:
+            for i in range(live_keys):
+                m.remove('r' + str(r - 1) + 'k' + str(i))
+        if r % 10 == 9:
+            miss_us = _time_per_call(m.get, missing)
+            print(f"round {r + 1:>3}: size {m.get_size()} capacity {m.get_capacity()} "
+                  f"tombstones {m.get_tombstone_count()} compactions {m.get_compaction_count()} "
+                  f"miss {miss_us:6.2f} us")
+
+
+def bench_shrink_after_purge(entries: int = 20_000, kept: int = 100) -> None:
+    """
+    Fills both HashMap variants and then purges almost every key, reporting how far the tables shrink
+
+    :param entries: An integer representing the number of keys inserted
+    :param kept: An integer representing the number of keys left after the purge
+
+    :return: None
+    """
+    print("\nSC & OA - shrink after purge")
+    print("----------------------------")
+    for name, m in (("SC", hash_map_sc.HashMap(11, hash_function_2)),
+                    ("OA", hash_map_oa.HashMap(11, hash_function_2))):
+        for i in range(entries):
+            m.put('key' + str(i), i)
+        full_capacity = m.get_capacity()
+        start = time.perf_counter()
+        for i in range(kept, entries):
+            m.remove('key' + str(i))
+        elapsed = time.perf_counter() - start
+        print(f"{name}: capacity {full_capacity} -> {m.get_capacity()} with {m.get_size()} keys left, "
+              f"purge took {elapsed:.3f} s")
+
+
+def bench_resize(entries: int = 1_000_000) -> None:
+    """
+    Compares resize_table against rebuilding the same table by calling put() for every pair, which is how
+    resize_table used to work. The builtin hash spreads the keys evenly, so the timings measure the rehash itself
+    rather than the clustering of a weak hash function.
+
+    :param entries: An integer representing the number of keys in the table being resized
+
+    :return: None
+    """
+    print("\nSC & OA - resize_table vs rebuilding with put()")
+    print("-----------------------------------------------")
+    for name, module in (("SC", hash_map_sc), ("OA", hash_map_oa)):
+        m = module.HashMap(4 * entries, hash)
+        for i in range(entries):
+            m.put('key' + str(i), i)
+        new_capacity = 2 * m.get_capacity()
+
+        start = time.perf_counter()
+        rebuilt = module.HashMap(new_capacity, hash)
+        pairs = m.get_keys_and_values()
+        for i in range(pairs.length()):
+            rebuilt.put(pairs[i][0], pairs[i][1])
+        put_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        m.resize_table(new_capacity)
+        resize_seconds = time.perf_counter() - start
+
+        print(f"{name}: {entries} entries  put rebuild {put_seconds:.3f} s  resize_table {resize_seconds:.3f} s  "
+              f"({put_seconds / resize_seconds:.1f}x)")
+
+
+def bench_put_latency(entries: int = 200_000) -> None:
+    """
+    Compares the worst-case and p99 put() latency of stop-the-world and incremental resizing. The garbage
+    collector is paused while timing so its own pauses do not hide the resize spikes.
+
+    :param entries: An integer representing the number of keys inserted into an initially small table
+
+    :return: None
+    """
+    print("\nSC & OA - put latency with stop-the-world vs incremental resizing")
+    print("-----------------------------------------------------------------")
+    keys = ['key' + str(i) for i in range(entries)]
+    for name, module in (("SC", hash_map_sc), ("OA", hash_map_oa)):
+        for incremental in (False, True):
+            m = module.HashMap(11, hash, incremental=incremental)
+            latencies = []
+            gc.disable()
+            total_start = time.perf_counter()
+            for key in keys:
+                start = time.perf_counter()
+                m.put(key, 0)
+                latencies.append(time.perf_counter() - start)
+            total = time.perf_counter() - total_start
+            gc.enable()
+            latencies.sort()
+            p99 = latencies[int(0.99 * len(latencies))] * 1e6
+            worst = latencies[-1] * 1e3
+            mode = "incremental  " if incremental else "stop-the-world"
+            print(f"{name} {mode}: total {total:.3f} s  p99 {p99:7.2f} us  max {worst:8.3f} ms")
+
+
+def bench_batch(entries: int = 100_000) -> None:
+    """
+    Compares the batch operations against calling the single-key operations in a loop
+
+    :param entries: An integer representing the number of keys loaded, looked up and removed
+
+    :return: None
+    """
+    print("\nSC & OA - batch operations vs single-key loops")
+    print("----------------------------------------------")
+    keys = ['key' + str(i) for i in range(entries)]
+    key_array = DynamicArray(keys)
+    pair_array = DynamicArray([(key, i) for i, key in enumerate(keys)])
+    for name, module in (("SC", hash_map_sc), ("OA", hash_map_oa)):
+        looped = module.HashMap(11, hash)
+        batched = module.HashMap(11, hash)
+        for label, single, batch in (
+                ("put", lambda: [looped.put(key, i) for i, key in enumerate(keys)],
+                 lambda: batched.put_many(pair_array)),
+                ("get", lambda: [looped.get(key) for key in keys],
+                 lambda: batched.get_many(key_array)),
+                ("contains", lambda: [looped.contains_key(key) for key in keys],
+                 lambda: batched.contains_many(key_array)),
+                ("remove", lambda: [looped.remove(key) for key in keys],
+                 lambda: batched.remove_many(key_array))):
+            start = time.perf_counter()
+            single()
+            single_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            batch()
+            batch_seconds = time.perf_counter() - start
+            print(f"{name} {label:<8}: single {single_seconds:.3f} s  batch {batch_seconds:.3f} s  "
+                  f"({single_seconds / batch_seconds:.1f}x)")
+
+
+def bench_vectorized_hash(count: int = 1_000_000) -> None:
+    """
+    Compares hashing a batch of keys one at a time against the vectorized NumPy hash functions
+
+    :param count: An integer representing the number of keys hashed
+
+    :return: None
+    """
+    print("\nVectorized hashing")
+    print("------------------")
+    if hash_vectorized._load_numpy() is None:
+        print("NumPy is not installed; the vectorized functions fall back to the scalar ones")
+    keys = ['key' + str(i) for i in range(count)]
+    for scalar, vectorized in ((hash_function_1, hash_vectorized.hash_function_1_many),
+                               (hash_function_2, hash_vectorized.hash_function_2_many)):
+        start = time.perf_counter()
+        expected = [scalar(key) for key in keys]
+        scalar_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        hashes = vectorized(keys)
+        vectorized_seconds = time.perf_counter() - start
+        print(f"{scalar.__name__}: {count} keys  scalar {scalar_seconds:.3f} s  vectorized {vectorized_seconds:.3f} s  "
+              f"({scalar_seconds / vectorized_seconds:.1f}x, identical: {hashes == expected})")
+
+
+def _key_sets(count: int) -> tuple:
+    """
+    Builds realistic key sets for the distribution benchmark
+
+    :param count: An integer representing the number of keys in each set
+
+    :return: A tuple of (name, list of keys) pairs
+    """
+    return (
+        ("sequential", ['key' + str(i) for i in range(count)]),
+        ("padded ids", ['user-' + str(i).zfill(8) for i in range(count)]),
+        ("paths", ['/api/v1/item/' + str(i % 97) + '/' + str(i) for i in range(count)]),
+    )
+
+
+def bench_hash_distribution(count: int = 10_000) -> None:
+    """
+    Reports the chain lengths of the Separate Chaining HashMap and the probe lengths of the Open Addressing HashMap
+    for every registered hash function over several key sets
+
+    :param count: An integer representing the number of keys in each set
+
+    :return: None
+    """
+    print("\nHash function quality: SC chain lengths and OA probe lengths")
+    print("------------------------------------------------------------")
+    for set_name, keys in _key_sets(count):
+        print(f"{set_name} keys:")
+        for function_name in hash_functions.hash_function_names():
+            sc = hash_map_sc.HashMap(count, function_name)
+            oa = hash_map_oa.HashMap(2 * count, function_name)
+            for key in keys:
+                sc.put(key, None)
+                oa.put(key, None)
+
+            # Chain lengths of the occupied SC buckets; buckets are only allocated once a key lands in them
+            chains = []
+            for i in range(sc.get_capacity()):
+                bucket = sc._buckets[i]
+                if bucket is not None and bucket.length():
+                    chains.append(bucket.length())
+
+            # Probes needed to reach each OA entry from the start of its probe sequence
+            probes = []
+            for index in range(oa.get_capacity()):
+                entry = oa._buckets[index]
+                if entry is not None and not entry.is_tombstone:
+                    i = 0
+                    while (entry.hash + i ** 2) % oa.get_capacity() != index:
+                        i += 1
+                    probes.append(i + 1)
+
+            print(f"  {function_name:<16} SC chains: mean {sum(chains) / len(chains):6.2f} max {max(chains):5}  "
+                  f"OA probes: mean {sum(probes) / len(probes):6.2f} max {max(probes):5}")
+
+
+def _unslotted(cls: type) -> type:
+    """
+    Copies a slotted class without its __slots__, so every instance carries a __dict__ again as it did before
+    the classes were slotted. A plain subclass would not do, since the inherited slots would still hold the fields.
+
+    :param cls: A class defining __slots__
+
+    :return: A class with the same methods whose instances store their fields in a __dict__
+    """
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in cls.__slots__ and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def bench_memory(entries: int = 100_000) -> None:
+    """
+    Measures with tracemalloc how many bytes each stored key/value pair costs, not counting the keys and values,
+    with the slotted entry, node and list classes and with unslotted copies of them as a baseline
+
+    :param entries: An integer representing the number of pairs stored
+
+    :return: None
+    """
+    print("\nSC & OA - memory per entry, slotted against unslotted")
+    print("----------------------------------------------------")
+    keys = ['key' + str(i) for i in range(entries)]
+
+    # Every module that constructs one of the classes looks it up by its global name
+    modules = (a6_include, hash_map_sc, hash_map_oa)
+    classes = ('SLNode', 'LinkedList', 'HashEntry')
+    slotted = {(module, name): getattr(module, name) for module in modules for name in classes
+               if hasattr(module, name)}
+    unslotted = {name: _unslotted(getattr(a6_include, name)) for name in classes}
+
+    for name, module in (("SC", hash_map_sc), ("OA", hash_map_oa)):
+        results = []
+        for variant in ("unslotted", "slotted"):
+            if variant == "unslotted":
+                for (owner, class_name) in slotted:
+                    setattr(owner, class_name, unslotted[class_name])
+            try:
+                tracemalloc.start()
+                before = tracemalloc.get_traced_memory()[0]
+                m = module.HashMap(11, hash)
+                for key in keys:
+                    m.put(key, None)
+                used = tracemalloc.get_traced_memory()[0] - before
+                tracemalloc.stop()
+            finally:
+                for (owner, class_name), cls in slotted.items():
+                    setattr(owner, class_name, cls)
+            results.append(used / entries)
+        print(f"{name}: {entries} entries, capacity {m.get_capacity()}: unslotted {results[0]:.1f} bytes per entry  "
+              f"slotted {results[1]:.1f} bytes per entry  ({1 - results[1] / results[0]:.0%} saved)")
+
+
+def bench_streaming(entries: int = 200_000, chunk_size: int = hash_map_oa.CHUNK_SIZE) -> None:
+    """
+    Copies a map into another through put_many(), once from a full get_keys_and_values() export and once streamed
+    from iter_chunks(), and compares the time and the peak memory used on top of the finished copy. The copies are
+    created large enough never to resize, so only the pairs in transit are measured.
+
+    :param entries: An integer representing the number of pairs stored
+    :param chunk_size: An integer representing the number of pairs in each streamed chunk
+
+    :return: None
+    """
+    print("\nSC & OA - copying a map through a full export against chunked streaming")
+    print("------------------------------------------------------------------------")
+    for name, module in (("SC", hash_map_sc), ("OA", hash_map_oa)):
+        m = module.HashMap(11, hash)
+        for i in range(entries):
+            m.put('key' + str(i), i)
+
+        results = []
+        for source in (lambda: m.get_keys_and_values(), lambda: m.iter_chunks(chunk_size)):
+            # Timed without tracemalloc, which slows every allocation down
+            copy = module.HashMap(4 * entries, hash)
+            start = time.perf_counter()
+            copy.put_many(source())
+            seconds = time.perf_counter() - start
+
+            copy = module.HashMap(4 * entries, hash)
+            tracemalloc.start()
+            copy.put_many(source())
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append((seconds, peak - current))
+
+        (full_seconds, full_memory), (chunked_seconds, chunked_memory) = results
+        print(f"{name}: {entries} entries: get_keys_and_values {full_seconds:.3f} s, {full_memory / 1024:.0f} KiB "
+              f"in transit  iter_chunks({chunk_size}) {chunked_seconds:.3f} s, {chunked_memory / 1024:.0f} KiB "
+              f"in transit")
+
+
+def bench_sparse_sc(capacity: int = 1_000_000, entries: int = 100) -> None:
+    """
+    Times construction, clear() and resize_table() of a large Separate Chaining HashMap holding only a few entries
+
+    :param capacity: An integer representing the capacity of the table
+    :param entries: An integer representing the number of keys stored
+
+    :return: None
+    """
+    print("\nSC - sparse map construction, clear and resize")
+    print("----------------------------------------------")
+    start = time.perf_counter()
+    m = hash_map_sc.HashMap(capacity, hash)
+    construct_seconds = time.perf_counter() - start
+    for i in range(entries):
+        m.put('key' + str(i), i)
+
+    start = time.perf_counter()
+    m.resize_table(2 * capacity)
+    resize_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    m.clear()
+    clear_seconds = time.perf_counter() - start
+
+    print(f"capacity {capacity}, {entries} entries: construct {construct_seconds * 1e3:.1f} ms  "
+          f"resize {resize_seconds * 1e3:.1f} ms  clear {clear_seconds * 1e3:.1f} ms")
+
+
+def bench_sc_long_chains(lookups: int = 2000) -> None:
+    """
+    Times hits, misses and updates on long Separate Chaining buckets kept as linked lists. The keys are anagrams of
+    each other, so hash_function_1 sends them all to one chain with the same hash. bench_treeify compares these
+    chains against sorted buckets.
+
+    :param lookups: An integer representing the number of operations timed for each case
+
+    :return: None
+    """
+    print("\nSC - hit, miss and update on long linked chains")
+    print("-----------------------------------------------")
+    # Raising the threshold past every chain length keeps the chains linked
+    threshold = hash_map_sc.TREEIFY_THRESHOLD
+    hash_map_sc.TREEIFY_THRESHOLD = float('inf')
+    try:
+        for length in (10, 100, 1000):
+            keys = [''.join(p) for p in itertools.islice(itertools.permutations('abcdefgh'), length + 1)]
+            missing = keys.pop()
+            m = hash_map_sc.HashMap(11, hash_function_1)
+            for key in keys:
+                m.put(key, 0)
+            hits = [keys[i % length] for i in range(lookups)]
+            hit_us = _time_per_call(m.get, hits)
+            miss_us = _time_per_call(m.get, [missing] * lookups)
+            update_us = _time_per_call(lambda key: m.put(key, 1), hits)
+            print(f"chain length {length:>4}: get hit {hit_us:8.2f} us  get miss {miss_us:8.2f} us  "
+                  f"put update {update_us:8.2f} us")
+    finally:
+        hash_map_sc.TREEIFY_THRESHOLD = threshold
+
+
+def bench_find_mode(count: int = 1_000_000, distinct: int = 10_000, k: int = 10) -> None:
+    """
+    Times find_mode() and top_k() on a large dynamic array, against counting with get() and put() on a map with
+    the same default hash function
+
+    :param count: An integer representing the number of elements in the array
+    :param distinct: An integer representing the number of distinct elements
+    :param k: An integer representing the number of heavy hitters found by top_k()
+
+    :return: None
+    """
+    print("\nSC - find_mode and top_k on a large array")
+    print("-----------------------------------------")
+    random.seed(0)
+    elements = ['item' + str(int(random.paretovariate(1.2)) % distinct) for _ in range(count)]
+    da = DynamicArray(elements)
+
+    start = time.perf_counter()
+    m = hash_map_sc.HashMap(count)
+    for element in elements:
+        m.put(element, (m.get(element) or 0) + 1)
+    get_put_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    modes, frequency = hash_map_sc.find_mode(da)
+    mode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    heavy = hash_map_sc.top_k(da, k)
+    top_seconds = time.perf_counter() - start
+
+    print(f"{count} elements: get/put counting {get_put_seconds:.2f} s  find_mode {mode_seconds:.2f} s  "
+          f"top_k({k}) {top_seconds:.2f} s")
+    print(f"mode {modes} x {frequency}, heaviest {heavy.get_at_index(0)}")
+
+
+def bench_counter(events: int = 500_000, distinct: int = 10_000) -> None:
+    """
+    Times counting a stream of events with get() and put() against CounterMap.increment() and update_from()
+
+    :param events: An integer representing the number of keys counted
+    :param distinct: An integer representing the number of distinct keys
+
+    :return: None
+    """
+    print("\nSC & OA - counting with get/put against CounterMap")
+    print("--------------------------------------------------")
+    random.seed(0)
+    keys = ['key' + str(random.randrange(distinct)) for _ in range(events)]
+    for name, module in (("SC", hash_map_sc), ("OA", hash_map_oa)):
+        m = module.HashMap(11, hash)
+        start = time.perf_counter()
+        for key in keys:
+            m.put(key, (m.get(key) or 0) + 1)
+        get_put_seconds = time.perf_counter() - start
+
+        counter = module.CounterMap(11, hash)
+        increment = counter.increment
+        start = time.perf_counter()
+        for key in keys:
+            increment(key)
+        increment_seconds = time.perf_counter() - start
+
+        counter = module.CounterMap(11, hash)
+        start = time.perf_counter()
+        counter.update_from(keys)
+        update_seconds = time.perf_counter() - start
+
+        print(f"{name}: {events} events: get/put {get_put_seconds:.2f} s  increment {increment_seconds:.2f} s  "
+              f"update_from {update_seconds:.2f} s")
+
+
+def _trial_division_next_prime(capacity: int) -> int:
+    """
+    The original capacity selection, trial dividing each odd candidate by every odd number up to its square root
+
+    :param capacity: An integer representing the desired capacity
+
+    :return: An integer representing the prime capacity
+    """
+    if capacity % 2 == 0:
+        capacity += 1
+    while True:
+        factor = 3
+        while factor ** 2 <= capacity and capacity % factor != 0:
+            factor += 2
+        if factor ** 2 > capacity:
+            return capacity
+        capacity += 2
+
+
+def bench_capacity(start: int = 11, limit: int = 400_000_000) -> None:
+    """
+    Times choosing every capacity of a doubling resize sequence with trial division, the sieve and Miller-Rabin
+    of capacity_policy, and its table of doubling primes
+
+    :param start: An integer representing the first capacity
+    :param limit: An integer bounding the last capacity
+
+    :return: None
+    """
+    print("\nCapacity selection over a doubling resize sequence")
+    print("--------------------------------------------------")
+    sizes = []
+    while start < limit:
+        sizes.append(start)
+        start *= 2
+
+    # Build the sieve and the doubling prime table up front, so only choosing the capacities is timed
+    capacity_policy.next_prime(capacity_policy.SIEVE_LIMIT - 1)
+    capacity_policy.doubling_primes()
+
+    for name, function in (("trial division", _trial_division_next_prime),
+                           ("next_prime", capacity_policy.next_prime),
+                           ("next_doubling_prime", capacity_policy.next_doubling_prime)):
+        begin = time.perf_counter()
+        capacities = [function(size) for size in sizes]
+        seconds = time.perf_counter() - begin
+        print(f"{name:>20}: {len(sizes)} resizes up to {capacities[-1]} in {seconds * 1000:8.3f} ms")
+
+
+def bench_power_of_two(entries: int = 20_000, lookups: int = 20_000) -> None:
+    """
+    Times puts, hits and misses of the Open Addressing HashMap with prime capacities and quadratic probing against
+    power-of-two capacities with masked triangular probing, for a weak and a strong hash function
+
+    :param entries: An integer representing the number of keys stored
+    :param lookups: An integer representing the number of lookups timed for each case
+
+    :return: None
+    """
+    print("\nOA - prime/modulo against power-of-two/mask capacities")
+    print("------------------------------------------------------")
+    keys = ['key' + str(i) for i in range(entries)]
+    missing = ['absent' + str(i) for i in range(lookups)]
+    hits = [keys[i % entries] for i in range(lookups)]
+    for function in (hash_function_1, hash_functions.fnv1a_hash):
+        for mode, kwargs in (("prime", {}), ("power of two", {'power_of_two': True}),
+                             ("power of two, load 0.75", {'power_of_two': True, 'max_load': 0.75})):
+            m = hash_map_oa.HashMap(11, function, **kwargs)
+            start = time.perf_counter()
+            for key in keys:
+                m.put(key, None)
+            put_us = (time.perf_counter() - start) / entries * 1e6
+            hit_us = _time_per_call(m.get, hits)
+            miss_us = _time_per_call(m.get, missing)
+            print(f"{function.__name__:>15} {mode:>23}: capacity {m.get_capacity():>6}  put {put_us:7.2f} us  "
+                  f"get hit {hit_us:7.2f} us  get miss {miss_us:7.2f} us")
+
+
+def _latency_percentiles(function, keys) -> tuple:
+    """
+    Times every call of a function separately
+
+    :param function: A function taking a single key
+    :param keys: A list of keys to call it with
+
+    :return: A tuple of the median and the 99th percentile latency in microseconds
+    """
+    timer = time.perf_counter
+    samples = []
+    for key in keys:
+        start = timer()
+        function(key)
+        samples.append(timer() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e6, samples[int(len(samples) * 0.99)] * 1e6
+
+
+def bench_robin_hood(entries: int = 100_000, lookups: int = 50_000) -> None:
+    """
+    Compares the quadratic probing Open Addressing HashMap filled to its 0.5 maximum load against the Robin Hood
+    HashMap filled to loads up to 0.9: memory per entry, and the median and tail latency of hits and misses
+
+    :param entries: An integer representing the number of keys stored
+    :param lookups: An integer representing the number of lookups timed for each case
+
+    :return: None
+    """
+    print("\nOA - quadratic probing against Robin Hood hashing")
+    print("-------------------------------------------------")
+    keys = ['key' + str(i) for i in range(entries)]
+    hits = [keys[(i * 7919) % entries] for i in range(lookups)]
+    missing = ['absent' + str(i) for i in range(lookups)]
+    gc.disable()
+    for name, module, load in (("quadratic, load 0.5", hash_map_oa, 0.5),
+                               ("Robin Hood, load 0.75", hash_map_rh, 0.75),
+                               ("Robin Hood, load 0.9", hash_map_rh, 0.9)):
+        # Size each table so it ends up just under its maximum load
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        m = module.HashMap(int(entries / load) + 2, hash, max_load=load, min_load=load / 8)
+        for key in keys:
+            m.put(key, None)
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        hit_median, hit_tail = _latency_percentiles(m.get, hits)
+        miss_median, miss_tail = _latency_percentiles(m.get, missing)
+        print(f"{name:>21}: load {m.table_load():.2f}  {used / entries:6.1f} bytes per entry  "
+              f"hit p50 {hit_median:5.2f} us p99 {hit_tail:5.2f} us  "
+              f"miss p50 {miss_median:5.2f} us p99 {miss_tail:5.2f} us")
+    gc.enable()
+
+
+def bench_cuckoo(entries: int = 100_000, anagrams: int = 2000, lookups: int = 20_000) -> None:
+    """
+    Compares the median and tail latency of hits and misses in the Separate Chaining, quadratic probing and cuckoo
+    HashMaps, for distinct keys under the builtin hash and for anagrams that all collide under hash_function_1
+
+    :param entries: An integer representing the number of distinct keys stored
+    :param anagrams: An integer representing the number of anagram keys stored
+    :param lookups: An integer representing the number of lookups timed for each case
+
+    :return: None
+    """
+    print("\nSC, OA & cuckoo - lookup latency")
+    print("--------------------------------")
+    anagram_keys = [''.join(p) for p in itertools.islice(itertools.permutations('abcdefgh'), anagrams + lookups)]
+    cases = (("distinct keys, builtin hash", hash, ['key' + str(i) for i in range(entries)],
+              ['absent' + str(i) for i in range(lookups)]),
+             ("anagrams, hash_function_1", hash_function_1, anagram_keys[:anagrams], anagram_keys[anagrams:]))
+    gc.disable()
+    for case, function, keys, missing in cases:
+        hits = [keys[(i * 7919) % len(keys)] for i in range(lookups)]
+        for name, module in (("SC", hash_map_sc), ("OA", hash_map_oa), ("cuckoo", hash_map_cuckoo)):
+            m = module.HashMap(11, function)
+            for key in keys:
+                m.put(key, None)
+            hit_median, hit_tail = _latency_percentiles(m.get, hits)
+            miss_median, miss_tail = _latency_percentiles(m.get, missing)
+            print(f"{case:>27} {name:>6}: hit p50 {hit_median:7.2f} us p99 {hit_tail:7.2f} us  "
+                  f"miss p50 {miss_median:7.2f} us p99 {miss_tail:7.2f} us")
+    gc.enable()
+
+
+def bench_swiss(entries: int = 100_000, lookups: int = 100_000, hit_ratio: float = 0.1) -> None:
+    """
+    Times a miss-heavy mix of lookups, and puts, in the quadratic probing Open Addressing HashMap against the Swiss
+    table HashMap, for a weak and a strong hash function
+
+    :param entries: An integer representing the number of keys stored
+    :param lookups: An integer representing the number of lookups timed
+    :param hit_ratio: A float representing the fraction of lookups that find their key
+
+    :return: None
+    """
+    print("\nOA - quadratic probing against Swiss table group probing")
+    print("--------------------------------------------------------")
+    random.seed(0)
+    keys = ['key' + str(i) for i in range(entries)]
+    mixed = [keys[random.randrange(entries)] if random.random() < hit_ratio else 'absent' + str(i)
+             for i in range(lookups)]
+    for function, count in ((hash, entries), (hash_function_2, entries // 20)):
+        for name, module in (("quadratic", hash_map_oa), ("Swiss table", hash_map_swiss)):
+            m = module.HashMap(11, function)
+            start = time.perf_counter()
+            for key in keys[:count]:
+                m.put(key, None)
+            put_us = (time.perf_counter() - start) / count * 1e6
+            get_us = _time_per_call(m.get, mixed[:count])
+            print(f"{function.__name__:>15} {name:>11}: {count} keys, load {m.table_load():.2f}  "
+                  f"put {put_us:7.2f} us  get ({hit_ratio:.0%} hits) {get_us:7.2f} us")
+
+
+def bench_treeify(lookups: int = 2000) -> None:
+    """
+    Times hits, misses and updates on collision-heavy Separate Chaining buckets with long chains left as linked
+    lists against chains converted to sorted buckets. The keys are anagrams, so hash_function_1 gives them all the
+    same hash and the sorted bucket orders them by key.
+
+    :param lookups: An integer representing the number of operations timed for each case
+
+    :return: None
+    """
+    print("\nSC - linked chains against sorted buckets on anagram keys")
+    print("---------------------------------------------------------")
+    threshold = hash_map_sc.TREEIFY_THRESHOLD
+    for length in (10, 100, 1000, 5000):
+        keys = [''.join(p) for p in itertools.islice(itertools.permutations('abcdefgh'), length + 1)]
+        missing = keys.pop()
+        hits = [keys[(i * 7919) % length] for i in range(lookups)]
+        for mode, limit in (("linked", float('inf')), ("sorted", threshold)):
+            # Raising the threshold past every chain length keeps the chains linked
+            hash_map_sc.TREEIFY_THRESHOLD = limit
+            m = hash_map_sc.HashMap(11, hash_function_1)
+            for key in keys:
+                m.put(key, 0)
+            hit_us = _time_per_call(m.get, hits)
+            miss_us = _time_per_call(m.get, [missing] * lookups)
+            update_us = _time_per_call(lambda key: m.put(key, 1), hits)
+            print(f"chain length {length:>4} {mode}: get hit {hit_us:8.2f} us  get miss {miss_us:8.2f} us  "
+                  f"put update {update_us:8.2f} us")
+    hash_map_sc.TREEIFY_THRESHOLD = threshold
+
+
+def bench_concurrent(operations: int = 200_000, keys: int = 10_000, read_ratio: float = 0.9) -> None:
+    """
+    Measures the throughput of a Separate Chaining HashMap behind one global lock against the striped
+    ConcurrentHashMap, for a read-mostly mix shared by a growing number of threads. Threads only run in parallel on
+    a free-threaded build of Python; with the GIL the result shows the cost of the locking itself.
+
+    :param operations: An integer representing the number of operations split across the threads
+    :param keys: An integer representing the number of distinct keys
+    :param read_ratio: A float representing the fraction of operations that are lookups
+
+    :return: None
+    """
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    title = f"SC - global lock against lock striping ({'GIL enabled' if gil else 'free-threaded'})"
+    print("\n" + title)
+    print("-" * len(title))
+
+    class GlobalLockMap:
+        """Separate Chaining HashMap with every call wrapped in one lock"""
+
+        def __init__(self) -> None:
+            self._map = hash_map_sc.HashMap(11, hash)
+            self._lock = threading.Lock()
+
+        def put(self, key: str, value: object) -> None:
+            with self._lock:
+                self._map.put(key, value)
+
+        def get(self, key: str) -> object:
+            with self._lock:
+                return self._map.get(key)
+
+    key_set = ['key' + str(i) for i in range(keys)]
+    for thread_count in (1, 2, 4, 8):
+        for name, m in (("global lock", GlobalLockMap()),
+                        ("striped", hash_map_concurrent.ConcurrentHashMap(11, hash))):
+            for key in key_set:
+                m.put(key, 0)
+
+            def work(seed: int) -> None:
+                generator = random.Random(seed)
+                for _ in range(operations // thread_count):
+                    key = key_set[generator.randrange(keys)]
+                    if generator.random() < read_ratio:
+                        m.get(key)
+                    else:
+                        m.put(key, seed)
+
+            threads = [threading.Thread(target=work, args=(seed,)) for seed in range(thread_count)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            seconds = time.perf_counter() - start
+            print(f"{thread_count} threads {name:>11}: {operations / seconds / 1000:8.1f} thousand operations/s")
+
+
+def bench_sharded(entries: int = 400_000, distinct: int = 10_000) -> None:
+    """
+    Measures bulk builds, lookups, full scans and mode counting on a ShardedHashMap with one shard per core up to
+    every core, against a single Separate Chaining HashMap in this process. Every batch is pickled through a pipe, so
+    a shard count above the number of cores only adds that cost.
+
+    :param entries: An integer representing the number of key/value pairs
+    :param distinct: An integer representing the number of distinct elements counted by find_mode
+
+    :return: None
+    """
+    cores = os.cpu_count() or 1
+    title = f"Sharded - 1 to {cores} cores against one in-process SC HashMap"
+    print("\n" + title)
+    print("-" * len(title))
+
+    pairs = DynamicArray([('key' + str(i), i) for i in range(entries)])
+    keys = DynamicArray(['key' + str(i) for i in range(entries)])
+    elements = DynamicArray([str(random.randrange(distinct)) for _ in range(entries)])
+
+    def run(name: str, m) -> None:
+        start = time.perf_counter()
+        m.put_many(pairs)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        m.get_many(keys)
+        lookup = time.perf_counter() - start
+        start = time.perf_counter()
+        m.get_keys_and_values()
+        scan = time.perf_counter() - start
+        start = time.perf_counter()
+        getattr(m, 'find_mode', hash_map_sc.find_mode)(elements)
+        mode = time.perf_counter() - start
+        print(f"{name:>16}: put_many {build:6.3f}s  get_many {lookup:6.3f}s  scan {scan:6.3f}s  "
+              f"find_mode {mode:6.3f}s")
+
+    run("in-process", hash_map_sc.HashMap(11, hash))
+
+    shard_counts = sorted({1 << i for i in range(cores.bit_length())} | {cores})
+    for shards in shard_counts:
+        with hash_map_sharded.ShardedHashMap(shards, 'sc', 11, hash) as m:
+            run(f"{shards} shards", m)
+
+
+if __name__ == "__main__":
+    bench_oa_miss_latency()
+    bench_oa_churn()
+    bench_shrink_after_purge()
+    bench_resize()
+    bench_put_latency()
+    bench_batch()
+    bench_vectorized_hash()
+    bench_hash_distribution()
+    bench_memory()
+    bench_streaming()
+    bench_sparse_sc()
+    bench_sc_long_chains()
+    bench_find_mode()
+    bench_counter()
+    bench_capacity()
+    bench_power_of_two()
+    bench_robin_hood()
+    bench_cuckoo()
+    bench_swiss()
+    bench_treeify()
+    bench_concurrent()
+    bench_sharded()
@@ -0,0 +1,266 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: Capacity selection shared by the HashMap implementations. Prime capacities below SIEVE_LIMIT are
+# looked up in a precomputed sieve and larger ones are found with a deterministic Miller-Rabin test, so choosing a
+# capacity no longer trial-divides on every resize. A table of roughly doubling primes and power-of-two helpers
+# are provided for callers that pick their own growth sizes, along with the validation of a resize policy and the
+# shrink target every HashMap uses. The sieve and the table are built on first use, and the
+# sieve only grows as far as the capacities asked about, so importing the module and building small tables stay
+# cheap.
+
+import bisect
+
+
+# Capacities below this are looked up in the sieve
+SIEVE_LIMIT = 1 << 20
+
+# Smallest sieve built, so the first few small tables do not each extend it
+_MIN_SIEVE = 1 << 10
+
+# Bases that make Miller-Rabin exact for every integer below 3.3 * 10 ** 24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _build_sieve(limit: int) -> bytearray:
+    """
+    Sieve of Eratosthenes
+
+    :param limit: An integer bounding the sieve
+
+    :return: A bytearray holding 1 at every prime index below limit and 0 everywhere else
+    """
+    sieve = bytearray([1]) * limit
+    sieve[0] = sieve[1] = 0
+    for factor in range(2, int(limit ** 0.5) + 1):
+        if sieve[factor]:
+            sieve[factor * factor::factor] = bytes(len(range(factor * factor, limit, factor)))
+    return sieve
+
+
+# Grown on demand by _sieve_covering(); empty until the first lookup
+_sieve = bytearray()
+
+
+def _sieve_covering(capacity: int) -> bytearray:
+    """
+    Returns the sieve, first rebuilding it at least twice as long as capacity, up to SIEVE_LIMIT, if it is too short
+    to hold it. Doubling the length keeps the number of rebuilds logarithmic and leaves room to find the next prime.
+
+    :param capacity: An integer below SIEVE_LIMIT that the sieve must cover
+
+    :return: A bytearray sieve longer than capacity
+    """
+    global _sieve
+    if capacity >= len(_sieve):
+        _sieve = _build_sieve(min(SIEVE_LIMIT, max(_MIN_SIEVE, next_power_of_two(capacity + 1) * 2)))
+    return _sieve
+
+
+def _miller_rabin(number: int) -> bool:
+    """
+    Deterministic Miller-Rabin primality test for an odd number above the sieve
+
+    :param number: An odd integer greater than every witness
+
+    :return: A boolean representing if the number is prime
+    """
+    exponent, shifts = number - 1, 0
+    while exponent % 2 == 0:
+        exponent //= 2
+        shifts += 1
+
+    for witness in _WITNESSES:
+        x = pow(witness, exponent, number)
+        if x == 1 or x == number - 1:
+            continue
+        for _ in range(shifts - 1):
+            x = x * x % number
+            if x == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(capacity: int) -> bool:
+    """
+    Determines if a capacity is a prime number
+
+    :param capacity: An integer representing a capacity
+
+    :return: A boolean representing if the capacity is prime
+    """
+    if capacity < SIEVE_LIMIT:
+        return capacity >= 2 and _sieve_covering(capacity)[capacity] == 1
+
+    # Rule out small factors before the more expensive test
+    for witness in _WITNESSES:
+        if capacity % witness == 0:
+            return False
+    return _miller_rabin(capacity)
+
+
+def next_prime(capacity: int) -> int:
+    """
+    Finds the smallest odd prime that is at least the given capacity, so 2 rounds up to 3
+
+    :param capacity: An integer representing the desired capacity
+
+    :return: An integer representing the prime capacity
+    """
+    if capacity < 3:
+        return 3
+
+    # The sieve is searched in C, one byte per candidate, and extended if no prime is left in it
+    while capacity < SIEVE_LIMIT:
+        sieve = _sieve_covering(capacity)
+        index = sieve.find(1, capacity)
+        if index != -1:
+            return index
+        capacity = len(sieve)
+
+    if capacity % 2 == 0:
+        capacity += 1
+    while not is_prime(capacity):
+        capacity += 2
+    return capacity
+
+
+def _build_doubling_primes() -> tuple:
+    """
+    Builds the table of roughly doubling primes, the smallest prime at or above each power of two from 8 to 2 ** 62
+
+    :param: None
+
+    :return: A tuple of increasing primes
+    """
+    return tuple(next_prime(1 << shift) for shift in range(3, 63))
+
+
+# Roughly doubling primes for tables that grow geometrically; None until first used
+_doubling_primes = None
+
+
+def doubling_primes() -> tuple:
+    """
+    Returns the table of roughly doubling primes, building it the first time
+
+    :param: None
+
+    :return: A tuple of increasing primes
+    """
+    global _doubling_primes
+    if _doubling_primes is None:
+        _doubling_primes = _build_doubling_primes()
+    return _doubling_primes
+
+
+def next_doubling_prime(capacity: int) -> int:
+    """
+    Finds the smallest prime of the doubling prime table that is at least the given capacity
+
+    :param capacity: An integer representing the desired capacity
+
+    :return: An integer representing the prime capacity
+    """
+    primes = doubling_primes()
+    index = bisect.bisect_left(primes, capacity)
+    if index == len(primes):
+        return next_prime(capacity)
+    return primes[index]
+
+
+def next_power_of_two(capacity: int) -> int:
+    """
+    Finds the smallest power of two that is at least the given capacity
+
+    :param capacity: An integer representing the desired capacity
+
+    :return: An integer representing the power-of-two capacity
+    """
+    if capacity <= 1:
+        return 1
+    return 1 << (capacity - 1).bit_length()
+
+
+def mix_hash(hash: int) -> int:
+    """
+    64-bit finalizer from MurmurHash3. Every input bit affects every output bit, so masking off the low bits of the
+    result indexes a power-of-two table evenly even when the original hash varies only in its high bits.
+
+    :param hash: An integer hash
+
+    :return: An integer representing the mixed 64-bit hash
+    """
+    hash &= _MASK_64
+    hash ^= hash >> 33
+    hash = (hash * 0xFF51AFD7ED558CCD) & _MASK_64
+    hash ^= hash >> 33
+    hash = (hash * 0xC4CEB9FE1A85EC53) & _MASK_64
+    hash ^= hash >> 33
+    return hash
+
+
+def check_load_limits(max_load: float, min_load: float, grow_factor: float, shrink_factor: float,
+                      below_one: bool = False) -> None:
+    """
+    Validates a resize policy. The load right after growing and right after shrinking must both sit strictly
+    between min_load and max_load, otherwise alternating puts and removes could resize on every call.
+
+    :param max_load: A float representing the load at which the table grows
+    :param min_load: A float representing the load below which the table shrinks
+    :param grow_factor: A float representing how much the table grows by
+    :param shrink_factor: A float representing how much the table shrinks by
+    :param below_one: A boolean representing if max_load must be less than 1, as in tables holding one entry per
+    bucket, whose probe sequences need an empty bucket to end at
+
+    :return: None
+    """
+    if grow_factor <= 1 or shrink_factor <= 1:
+        raise ValueError("grow_factor and shrink_factor must be greater than 1")
+
+    if not 0 <= min_load < max_load:
+        raise ValueError("min_load must be at least 0 and less than max_load")
+
+    if below_one and max_load >= 1:
+        raise ValueError("max_load must be less than 1, so probe sequences end at an empty bucket")
+
+    if max_load / grow_factor <= min_load or min_load * shrink_factor >= max_load:
+        raise ValueError("min_load is too close to max_load for the given grow and shrink factors")
+
+
+def shrink_target(capacity: int, size: int, min_capacity: int, min_load: float, shrink_factor: float) -> int:
+    """
+    Finds the capacity a table shrinks to, dividing it by shrink_factor until the entries hold the minimum load, but
+    never going below the starting capacity. Shrinking straight to the target means a bulk removal rebuilds once.
+
+    :param capacity: An integer representing the current capacity
+    :param size: An integer representing the number of entries
+    :param min_capacity: An integer representing the smallest capacity allowed
+    :param min_load: A float representing the load below which the table shrinks
+    :param shrink_factor: A float representing how much the table shrinks by at each step
+
+    :return: An integer representing the capacity to shrink to, before any rounding to a prime or power of two
+    """
+    while capacity > min_capacity and size < min_load * capacity:
+        capacity = max(min_capacity, int(capacity / shrink_factor))
+    return capacity
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nnext_prime")
+    print("----------")
+    print([next_prime(capacity) for capacity in (0, 1, 2, 3, 4, 53, 106, 111, SIEVE_LIMIT - 1, 10 ** 8)])
+
+    print("\nDoubling primes")
+    print("---------------")
+    print(doubling_primes()[:8], next_doubling_prime(100), next_doubling_prime(1000))
+
+    print("\nPowers of two")
+    print("-------------")
+    print(next_power_of_two(1), next_power_of_two(100), next_power_of_two(1024), hex(mix_hash(1)))
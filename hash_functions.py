@@ -0,0 +1,164 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: Stronger hash functions for the HashMap implementations and a registry that lets the HashMap
+# constructors select a hash function by name. hash_function_1 and hash_function_2 collide on anagrams and cluster
+# on sequential keys; the functions below spread such keys evenly.
+
+from a6_include import hash_function_1, hash_function_2
+
+
+_MASK_32 = 0xFFFFFFFF
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+_FNV_OFFSET_64 = 0xCBF29CE484222325
+_FNV_PRIME_64 = 0x100000001B3
+
+_XXH_PRIME_1 = 0x9E3779B1
+_XXH_PRIME_2 = 0x85EBCA77
+_XXH_PRIME_3 = 0xC2B2AE3D
+_XXH_PRIME_4 = 0x27D4EB2F
+_XXH_PRIME_5 = 0x165667B1
+
+
+def fnv1a_hash(key: str) -> int:
+    """64-bit FNV-1a hash of the UTF-8 bytes of a key"""
+    hash = _FNV_OFFSET_64
+    for byte in key.encode('utf-8'):
+        hash = ((hash ^ byte) * _FNV_PRIME_64) & _MASK_64
+    return hash
+
+
+def _rotate_left_32(value: int, count: int) -> int:
+    """Rotate a 32-bit integer left by count bits"""
+    return ((value << count) | (value >> (32 - count))) & _MASK_32
+
+
+def _xxh32_round(accumulator: int, lane: int) -> int:
+    """Mix one 4-byte lane into an xxHash32 accumulator"""
+    accumulator = (accumulator + lane * _XXH_PRIME_2) & _MASK_32
+    return (_rotate_left_32(accumulator, 13) * _XXH_PRIME_1) & _MASK_32
+
+
+def xxhash32(key: str, seed: int = 0) -> int:
+    """32-bit xxHash (XXH32) of the UTF-8 bytes of a key"""
+    data = key.encode('utf-8')
+    length = len(data)
+    index = 0
+
+    # Consume 16-byte stripes with four independent accumulators
+    if length >= 16:
+        v1 = (seed + _XXH_PRIME_1 + _XXH_PRIME_2) & _MASK_32
+        v2 = (seed + _XXH_PRIME_2) & _MASK_32
+        v3 = seed & _MASK_32
+        v4 = (seed - _XXH_PRIME_1) & _MASK_32
+        while index <= length - 16:
+            v1 = _xxh32_round(v1, int.from_bytes(data[index:index + 4], 'little'))
+            v2 = _xxh32_round(v2, int.from_bytes(data[index + 4:index + 8], 'little'))
+            v3 = _xxh32_round(v3, int.from_bytes(data[index + 8:index + 12], 'little'))
+            v4 = _xxh32_round(v4, int.from_bytes(data[index + 12:index + 16], 'little'))
+            index += 16
+        hash = (_rotate_left_32(v1, 1) + _rotate_left_32(v2, 7) +
+                _rotate_left_32(v3, 12) + _rotate_left_32(v4, 18)) & _MASK_32
+    else:
+        hash = (seed + _XXH_PRIME_5) & _MASK_32
+
+    hash = (hash + length) & _MASK_32
+
+    # Consume the remaining 4-byte words and then single bytes
+    while index + 4 <= length:
+        hash = (hash + int.from_bytes(data[index:index + 4], 'little') * _XXH_PRIME_3) & _MASK_32
+        hash = (_rotate_left_32(hash, 17) * _XXH_PRIME_4) & _MASK_32
+        index += 4
+    while index < length:
+        hash = (hash + data[index] * _XXH_PRIME_5) & _MASK_32
+        hash = (_rotate_left_32(hash, 11) * _XXH_PRIME_1) & _MASK_32
+        index += 1
+
+    # Final avalanche
+    hash ^= hash >> 15
+    hash = (hash * _XXH_PRIME_2) & _MASK_32
+    hash ^= hash >> 13
+    hash = (hash * _XXH_PRIME_3) & _MASK_32
+    hash ^= hash >> 16
+    return hash
+
+
+def seeded_builtin_hash(seed: int = 0):
+    """
+    Builds a hash function from Python's builtin hash, mixed with a seed so separate maps can use different
+    functions. String hashing is randomized per process unless PYTHONHASHSEED is set, so the values are only
+    stable within a single run.
+
+    :param seed: An integer mixed into every hash
+
+    :return: A hash function taking a single key
+    """
+    def builtin_hash(key: str) -> int:
+        """Python's builtin hash of a key, mixed with a seed"""
+        return hash((seed, key))
+
+    return builtin_hash
+
+
+_REGISTRY = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': fnv1a_hash,
+    'xxhash32': xxhash32,
+    'builtin': seeded_builtin_hash(0),
+}
+
+
+def register_hash_function(name: str, function) -> None:
+    """
+    Adds a hash function to the registry so the HashMap constructors can select it by name
+
+    :param name: A string naming the hash function
+    :param function: A hash function taking a single key
+
+    :return: None
+    """
+    _REGISTRY[name] = function
+
+
+def hash_function_names() -> list:
+    """
+    Returns the names of every registered hash function
+
+    :param: None
+
+    :return: A list of strings
+    """
+    return list(_REGISTRY)
+
+
+def get_hash_function(function):
+    """
+    Resolves a hash function given either the function itself or its registered name
+
+    :param function: A hash function taking a single key, or a string naming a registered one
+
+    :return: A hash function taking a single key
+    """
+    if not isinstance(function, str):
+        return function
+
+    if function not in _REGISTRY:
+        raise ValueError(f"Unknown hash function '{function}', expected one of {hash_function_names()}")
+    return _REGISTRY[function]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nReference values")
+    print("----------------")
+    print(hex(fnv1a_hash('')), hex(fnv1a_hash('a')))
+    print(hex(xxhash32('')), hex(xxhash32('abc')), hex(xxhash32('Nobody inspects the spammish repetition')))
+
+    print("\nAnagrams")
+    print("--------")
+    for name in hash_function_names():
+        function = get_hash_function(name)
+        print(name, function('str12') == function('str21'))
@@ -0,0 +1,362 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: Thread-safe HashMap with lock striping. The keys are split by hash across a fixed number of
+# segments, each a Separate Chaining HashMap guarded by its own lock, so threads working on different segments never
+# wait for each other and a resize only ever blocks the one segment it rebuilds. Reads do not take the lock: they
+# check a per-segment sequence counter around the lookup and retry under the lock if a write overlapped.
+
+import threading
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_functions import get_hash_function
+import hash_map_sc
+
+
+# Optimistic reads attempted before a lookup falls back to taking the segment lock
+_READ_ATTEMPTS = 2
+
+
+class Segment:
+    """
+    One stripe of a ConcurrentHashMap: a Separate Chaining HashMap, the lock guarding every change to it, and a
+    sequence counter that is odd exactly while a change is in progress
+    """
+
+    __slots__ = ('map', 'lock', 'sequence')
+
+    def __init__(self, hash_map: hash_map_sc.HashMap) -> None:
+        """Initialize the segment around an empty map, unlocked and settled."""
+        self.map = hash_map
+        self.lock = threading.Lock()
+        self.sequence = 0
+
+
+class ConcurrentHashMap:
+    def __init__(self, capacity: int = 11, function=hash_function_1, segments: int = 16, **options) -> None:
+        """
+        Initialize new HashMap that can be shared between threads.
+        The capacity is split evenly across the segments, and any other options, such as max_load, are passed on
+        to the Separate Chaining HashMap of every segment. Segments resize one at a time, never incrementally, so
+        readers only ever race with a single stop-the-world rebuild.
+        """
+        if segments < 1:
+            raise ValueError("segments must be at least 1")
+        if options.get('incremental'):
+            raise ValueError("segments can not resize incrementally, since lookups would then have to migrate")
+
+        self._hash_function = get_hash_function(function)
+        self._segments = tuple(Segment(hash_map_sc.HashMap(max(1, capacity // segments), self._hash_function,
+                                                           **options))
+                               for _ in range(segments))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i, segment in enumerate(self._segments):
+            with segment.lock:
+                out += 'segment ' + str(i) + ':\n' + str(segment.map)
+        return out
+
+    def _segment(self, hash: int) -> Segment:
+        """
+        Picks the segment holding a key
+
+        :param hash: An integer representing the hash of the key
+
+        :return: The Segment for the key
+        """
+        # The high bits are folded in so the choice of segment does not repeat the choice of bucket inside it
+        return self._segments[(hash ^ (hash >> 16)) % len(self._segments)]
+
+    def get_size(self) -> int:
+        """
+        Return size of map. Changes made while the segments are counted may or may not be included.
+        """
+        return sum(segment.map.get_size() for segment in self._segments)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the buckets of every segment together
+        """
+        return sum(segment.map.get_capacity() for segment in self._segments)
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key exists it updates the value, otherwise it adds a new
+        key/value pair
+
+        :param key: A string representing the key in the key value pair
+        :param value: An object representing the object in the key value pair
+
+        :return: None
+        """
+        hash = self._hash_function(key)
+        segment = self._segment(hash)
+        with segment.lock:
+            segment.sequence += 1
+            try:
+                segment.map._put_hashed(key, value, hash)
+            finally:
+                segment.sequence += 1
+
+    def get(self, key: str) -> object:
+        """
+        Finds the value in the hash table when passed a key. The lookup runs without the segment lock and is only
+        repeated under it if the segment changed while it ran.
+
+        :param key: A string representing the key to find in the hash table
+
+        :return: An object representing the value corresponding to the found key or None if the key doesn't exist
+        """
+        hash = self._hash_function(key)
+        segment = self._segment(hash)
+        node = self._read(segment, key, hash)
+        return node.value if node is not None else None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Determines is a given key is in the hash table
+
+        :param key: A string representing the key to find
+
+        :return: A boolean representing if the key is found
+        """
+        hash = self._hash_function(key)
+        return self._read(self._segment(hash), key, hash) is not None
+
+    def _read(self, segment: Segment, key: str, hash: int):
+        """
+        Looks a key up in a segment, first without its lock. A lookup that starts while the sequence counter is odd
+        or ends after it has moved may have seen a half-finished change, so it is retried, and after a few attempts
+        taken under the lock.
+
+        :param segment: The Segment holding the key
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: The SLNode holding the key, or None if the key doesn't exist
+        """
+        for _ in range(_READ_ATTEMPTS):
+            sequence = segment.sequence
+            if sequence % 2 == 0:
+                # A rebuild running alongside can leave the lookup looking past the end of the new table
+                try:
+                    node = segment.map._find(key, hash)
+                except IndexError:
+                    continue
+                if segment.sequence == sequence:
+                    return node
+
+        with segment.lock:
+            return segment.map._find(key, hash)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map,
+        otherwise does nothing if the key doesn't exist.
+
+        :param key: A string representing the key to find
+
+        :return: None
+        """
+        hash = self._hash_function(key)
+        segment = self._segment(hash)
+        with segment.lock:
+            segment.sequence += 1
+            try:
+                if segment.map._remove_hashed(key, hash):
+                    segment.map._shrink()
+            finally:
+                segment.sequence += 1
+
+    def put_many(self, pairs: DynamicArray) -> None:
+        """
+        Updates or adds every key/value pair in a dynamic array, taking the lock of each segment once for all of
+        its pairs
+
+        :param pairs: A DynamicArray of (key, value) tuples
+
+        :return: None
+        """
+        # Group the pairs by segment. The underlying list is read directly to skip the bounds checks of
+        # DynamicArray.
+        groups = [[] for _ in self._segments]
+        count = len(self._segments)
+        for key, value in pairs._data:
+            hash = self._hash_function(key)
+            groups[(hash ^ (hash >> 16)) % count].append((key, value, hash))
+
+        for segment, group in zip(self._segments, groups):
+            if not group:
+                continue
+            with segment.lock:
+                segment.sequence += 1
+                try:
+                    for key, value, hash in group:
+                        segment.map._put_hashed(key, value, hash)
+                finally:
+                    segment.sequence += 1
+
+    def table_load(self) -> float:
+        """
+        Calculates the current hash table load factor across every segment.
+
+        :param: None
+
+        :return: A float representing the table load factor.
+        """
+        # Use 𝝺 = n/m to calculate load
+        return self.get_size() / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        Finds the number of empty buckets across every segment
+
+        :param: None
+
+        :return: An integer representing the number of empty buckets in the table
+        """
+        return sum(segment.map.empty_buckets() for segment in self._segments)
+
+    def _lock_all(self) -> None:
+        """
+        Takes the lock of every segment, always in the same order so two callers can not deadlock, and marks each
+        segment as changing
+
+        :param: None
+
+        :return: None
+        """
+        for segment in self._segments:
+            segment.lock.acquire()
+            segment.sequence += 1
+
+    def _unlock_all(self) -> None:
+        """
+        Marks every segment as settled and releases its lock
+
+        :param: None
+
+        :return: None
+        """
+        for segment in reversed(self._segments):
+            segment.sequence += 1
+            segment.lock.release()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the whole hash map, splitting it evenly across the segments. Every segment is locked
+        for the duration, so no thread sees some segments resized and others not.
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        # Do nothing if the desired capacity is less than 1
+        if new_capacity < 1:
+            return
+
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                segment.map.resize_table(max(1, new_capacity // len(self._segments)))
+        finally:
+            self._unlock_all()
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map while maintaining the capacity.
+
+        :param: None
+
+        :return: None
+        """
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                segment.map.clear()
+        finally:
+            self._unlock_all()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map, taken from every segment at the same moment
+
+        :param: None
+
+        :return: A Dynamic array in which each index contains a tuple of a key/value pair
+        stored in the hash map
+        """
+        self._lock_all()
+        try:
+            return DynamicArray([item for segment in self._segments for item in segment.map.items()])
+        finally:
+            self._unlock_all()
+
+    def items(self):
+        """
+        Returns an iterator over a snapshot of the key/value pairs in the hash map, so other threads can keep
+        changing the map while it is walked
+
+        :param: None
+
+        :return: An iterator yielding (key, value) tuples
+        """
+        return iter(self.get_keys_and_values()._data)
+
+    def keys(self):
+        """
+        Returns an iterator over a snapshot of the keys in the hash map
+
+        :param: None
+
+        :return: An iterator yielding keys
+        """
+        return (key for key, _ in self.items())
+
+    def values(self):
+        """
+        Returns an iterator over a snapshot of the values in the hash map
+
+        :param: None
+
+        :return: An iterator yielding values
+        """
+        return (value for _, value in self.items())
+
+    def __iter__(self):
+        """
+        Returns an iterator over a snapshot of the keys in the hash map
+
+        :param: None
+
+        :return: An iterator yielding keys
+        """
+        return self.keys()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput, get and remove from several threads")
+    print("----------------------------------------")
+    m = ConcurrentHashMap(64, hash_function_2, segments=4)
+
+    def work(thread: int) -> None:
+        for i in range(2000):
+            m.put('t' + str(thread) + '-' + str(i), i)
+        for i in range(0, 2000, 2):
+            m.remove('t' + str(thread) + '-' + str(i))
+
+    threads = [threading.Thread(target=work, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(m.get_size(), m.get('t0-1'), m.get('t3-1999'), m.contains_key('t2-10'))
@@ -0,0 +1,488 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: HashMap using cuckoo hashing, an alternative to hash_map_sc and hash_map_oa for read-mostly tables.
+# Every key has one bucket in each of two tables, chosen by two independent hash functions, so a lookup inspects
+# at most two buckets plus a small stash. An insert that finds both buckets taken evicts one of the entries to its
+# other bucket, and so on; an insert that keeps evicting ends up in the stash, and a full stash grows the tables.
+
+from a6_include import DynamicArray, HashEntry, hash_function_1, hash_function_2
+from capacity_policy import check_load_limits, is_prime, mix_hash, next_prime, shrink_target
+from hash_functions import get_hash_function
+
+
+# XORed into the second hash before mixing, so the two table indices differ even when both functions agree
+_SECOND_SEED = 0x9E3779B97F4A7C15
+
+# Number of capacities tried by a rebuild before it settles for a full stash
+_RESIZE_ATTEMPTS = 4
+
+
+class CuckooEntry(HashEntry):
+    """
+    HashEntry that also caches the second hash of its key, so evicting it does not hash the key again
+    """
+
+    __slots__ = ('second_hash',)
+
+    def __init__(self, key: str, value: object, hash: int, second_hash: int) -> None:
+        super().__init__(key, value, hash)
+        self.second_hash = second_hash
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, second_function='builtin', max_load: float = 0.45,
+                 min_load: float = 0.05, grow_factor: float = 2.0, shrink_factor: float = 2.0,
+                 stash_size: int = 4, max_evictions: int = 32) -> None:
+        """
+        Initialize new HashMap that uses
+        cuckoo hashing for collision resolution.
+        Both hash functions may be given directly or by their names in the hash_functions registry. The second one
+        should differ from the first, since keys that collide under both can only be told apart in the stash.
+        The capacity counts the buckets of both tables together. The tables grow by grow_factor once the load
+        reaches max_load, which should stay below 0.5 for inserts to rarely need the stash, and shrink by
+        shrink_factor once the load drops below min_load, but never below the starting capacity.
+        An insert evicts at most max_evictions entries before the one left over goes to the stash, and the tables
+        grow early once the stash holds stash_size entries.
+        """
+        check_load_limits(max_load, min_load, grow_factor, shrink_factor, below_one=True)
+
+        # Each table holds half the capacity and must have a prime number of buckets
+        self._table_capacity = next_prime(capacity // 2)
+        self._first = DynamicArray([None] * self._table_capacity)
+        self._second = DynamicArray([None] * self._table_capacity)
+
+        # Entries that found no bucket within max_evictions evictions
+        self._stash = DynamicArray()
+        self._stash_size = stash_size
+        self._stash_limit = stash_size
+        self._max_evictions = max_evictions
+
+        self._hash_function = get_hash_function(function)
+        self._second_hash_function = get_hash_function(second_function)
+        self._size = 0
+
+        # Changes whenever entries are added, removed or moved, so iterators can detect it
+        self._version = 0
+
+        # Resize policy
+        self._max_load = max_load
+        self._min_load = min_load
+        self._grow_factor = grow_factor
+        self._shrink_factor = shrink_factor
+        self._min_capacity = self.get_capacity()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for name, table in (('first', self._first), ('second', self._second)):
+            for i in range(table.length()):
+                out += name + ' ' + str(i) + ': ' + str(table[i]) + '\n'
+        for i in range(self._stash.length()):
+            out += 'stash ' + str(i) + ': ' + str(self._stash[i]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the buckets of both tables together
+        """
+        return 2 * self._table_capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> CuckooEntry:
+        """
+        Finds the entry for a key whose first hash has already been computed. Only the bucket of the key in each
+        table and the stash are inspected.
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the first hash of the key
+
+        :return: The CuckooEntry holding the key, or None if the key doesn't exist
+        """
+        # The underlying lists are indexed directly to skip the bounds checks of DynamicArray
+        entry = self._first._data[mix_hash(hash) % self._table_capacity]
+        if entry is not None and entry.hash == hash and entry.key == key:
+            return entry
+
+        # The second hash is only computed when the first bucket misses
+        second_hash = self._second_hash_function(key)
+        entry = self._second._data[mix_hash(second_hash ^ _SECOND_SEED) % self._table_capacity]
+        if entry is not None and entry.second_hash == second_hash and entry.key == key:
+            return entry
+
+        for entry in self._stash._data:
+            if entry.hash == hash and entry.key == key:
+                return entry
+
+        return None
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key exists it updates the value, otherwise it adds a new
+        key/value pair
+
+        :param key: A string representing the key in the key value pair
+        :param value: An object representing the object in the key value pair
+
+        :return: None
+        """
+        hash = self._hash_function(key)
+
+        # Check if the table contains the key. If so update the value.
+        entry = self._find(key, hash)
+        if entry is not None:
+            entry.value = value
+            return
+
+        # Grow the tables if adding a key would take the load past the maximum load
+        if self._size + 1 > self._max_load * self.get_capacity():
+            self._resize(int(self._grow_factor * self.get_capacity()))
+
+        self._insert(CuckooEntry(key, value, hash, self._second_hash_function(key)))
+        self._size += 1
+        self._version += 1
+
+        # A full stash means evictions keep failing, so grow the tables to make room for its entries
+        if self._stash.length() >= self._stash_limit:
+            self._resize(int(self._grow_factor * self.get_capacity()))
+
+    def _insert(self, entry: CuckooEntry) -> None:
+        """
+        Puts an entry whose key is known not to be in the hash map into its bucket of the first table, evicting the
+        entry already there into its bucket of the other table, and so on. The entry left over after max_evictions
+        evictions goes to the stash.
+
+        :param entry: A CuckooEntry with both hashes cached
+
+        :return: None
+        """
+        capacity = self._table_capacity
+        first, second = self._first._data, self._second._data
+
+        for _ in range(self._max_evictions):
+            index = mix_hash(entry.hash) % capacity
+            entry, first[index] = first[index], entry
+            if entry is None:
+                return
+
+            index = mix_hash(entry.second_hash ^ _SECOND_SEED) % capacity
+            entry, second[index] = second[index], entry
+            if entry is None:
+                return
+
+        self._stash.append(entry)
+
+    def table_load(self) -> float:
+        """
+        Calculates the current hash table load factor.
+
+        :param: None
+
+        :return: A float representing the table load factor.
+        """
+        # Use 𝝺 = n/m to calculate load
+        return self._size / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        Finds the number of empty buckets in both tables. Entries in the stash take up no bucket.
+
+        :param: None
+
+        :return: An integer representing the number of empty buckets in the tables
+        """
+        return self.get_capacity() - (self._size - self._stash.length())
+
+    def stats(self) -> dict:
+        """
+        Reports the occupancy counters of the hash map
+
+        :param: None
+
+        :return: A dictionary of the size, capacity, load factor and empty buckets of the tables and the number of
+        entries in the stash
+        """
+        return {
+            'size': self._size,
+            'capacity': self.get_capacity(),
+            'table_load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'stashed': self._stash.length(),
+        }
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash tables while maintaining and rehashing the existing key/value pairs
+
+        :param new_capacity: An integer representing desired capacity for both hash tables together
+
+        :return: None
+        """
+        # Do nothing if the desired capacity is less than the table size
+        if new_capacity < self._size:
+            return
+
+        self._resize(new_capacity)
+
+        # An explicitly requested capacity becomes the floor for automatic shrinking
+        self._min_capacity = self.get_capacity()
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Rebuilds both hash tables at a new capacity, growing it a few more times if the entries leave the stash full
+
+        :param new_capacity: An integer representing desired capacity for both hash tables together
+
+        :return: None
+        """
+        self._version += 1
+        entries = [entry for entry in self._first._data + self._second._data + self._stash._data
+                   if entry is not None]
+
+        # Round the capacity up to two prime tables, growing it until the entries fit under the maximum load
+        table_capacity = new_capacity // 2
+        if not is_prime(table_capacity):
+            table_capacity = next_prime(table_capacity)
+        while self._size > self._max_load * 2 * table_capacity:
+            table_capacity = next_prime(int(self._grow_factor * table_capacity))
+
+        stashed = self._stash.length() or len(entries)
+        for attempt in range(_RESIZE_ATTEMPTS):
+            self._table_capacity = table_capacity
+            self._first = DynamicArray([None] * table_capacity)
+            self._second = DynamicArray([None] * table_capacity)
+            self._stash = DynamicArray()
+
+            # Place the existing entries using their cached hashes. Keys are known to be unique, so no key is
+            # compared.
+            for entry in entries:
+                self._insert(entry)
+
+            # Stop once the stash has room, or once growing no longer empties it
+            if self._stash.length() < self._stash_size or self._stash.length() >= stashed:
+                break
+            stashed = self._stash.length()
+            table_capacity = next_prime(int(self._grow_factor * table_capacity))
+
+        # Keys whose hashes agree under both functions can not be separated by growing, so once growing has failed
+        # to empty the stash, the tables only grow again after it doubles
+        self._stash_limit = max(self._stash_size, 2 * self._stash.length())
+
+    def get(self, key: str) -> object:
+        """
+        Finds the value in the hash table when passed a key
+
+        :param key: A string representing the key to find in the hash table
+
+        :return: An object representing the value corresponding to the found key or None if the key doesn't exist
+        """
+        entry = self._find(key, self._hash_function(key))
+        if entry is None:
+            return None
+        return entry.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Determines is a given key is in the hash table
+
+        :param key: A string representing the key to find
+
+        :return: A boolean representing if the key is found
+        """
+        return self._find(key, self._hash_function(key)) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map,
+        otherwise does nothing if the key doesn't exist.
+
+        :param key: A string representing the key to find
+
+        :return: None
+        """
+        hash = self._hash_function(key)
+        entry = self._find(key, hash)
+        if entry is None:
+            return
+
+        # Empty the bucket or stash slot holding the entry
+        index = mix_hash(hash) % self._table_capacity
+        second_index = mix_hash(entry.second_hash ^ _SECOND_SEED) % self._table_capacity
+        if self._first._data[index] is entry:
+            self._first._data[index] = None
+        elif self._second._data[second_index] is entry:
+            self._second._data[second_index] = None
+        else:
+            self._stash._data.remove(entry)
+
+        self._size -= 1
+        self._version += 1
+
+        # Shrink the tables once the load drops below the minimum load
+        if self.get_capacity() > self._min_capacity and self.table_load() < self._min_load:
+            self._resize(shrink_target(self.get_capacity(), self._size, self._min_capacity, self._min_load,
+                                       self._shrink_factor))
+
+        # Otherwise give a stashed entry the chance to move into the freed bucket
+        elif self._stash.length() > 0:
+            stashed = self._stash._data
+            for entry in stashed:
+                if mix_hash(entry.hash) % self._table_capacity == index and self._first._data[index] is None:
+                    self._first._data[index] = entry
+                    stashed.remove(entry)
+                    break
+                if (mix_hash(entry.second_hash ^ _SECOND_SEED) % self._table_capacity == second_index
+                        and self._second._data[second_index] is None):
+                    self._second._data[second_index] = entry
+                    stashed.remove(entry)
+                    break
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map while maintaining the capacity.
+
+        :param: None
+
+        :return: None
+        """
+        self._version += 1
+        self._first = DynamicArray([None] * self._table_capacity)
+        self._second = DynamicArray([None] * self._table_capacity)
+        self._stash = DynamicArray()
+        self._stash_limit = self._stash_size
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map
+
+        :param: None
+
+        :return: A Dynamic array in which each index contains a tuple of a key/value pair
+        stored in the hash map
+        """
+        return DynamicArray([(entry.key, entry.value) for entry in self])
+
+    def __iter__(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the CuckooEntry objects in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding CuckooEntry objects
+        """
+        return HashMapIterator(self, 'entries')
+
+    def keys(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the keys in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding keys
+        """
+        return HashMapIterator(self, 'keys')
+
+    def values(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the values in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding values
+        """
+        return HashMapIterator(self, 'values')
+
+    def items(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the key/value pairs in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding (key, value) tuples
+        """
+        return HashMapIterator(self, 'items')
+
+
+class HashMapIterator:
+    """
+    Separate iterator class for HashMap. Each iterator keeps its own position, so several can walk the same map
+    at once. Adding, removing or moving entries while an iterator is in use makes it raise RuntimeError.
+    """
+
+    __slots__ = ('_map', '_buckets', '_index', '_version', '_view')
+
+    def __init__(self, hash_map: HashMap, view: str) -> None:
+        """
+        Initialize the iterator at the first bucket of a map
+
+        :param hash_map: The HashMap to iterate over
+        :param view: A string selecting what is yielded: 'entries', 'keys', 'values' or 'items'
+        """
+        self._map = hash_map
+        self._buckets = (hash_map._first._data, hash_map._second._data, hash_map._stash._data)
+        self._index = (0, 0)
+        self._version = hash_map._version
+        self._view = view
+
+    def __iter__(self) -> "HashMapIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> object:
+        """Skip empty buckets of both tables and then the stash, and return the next entry in the selected view."""
+        if self._map._version != self._version:
+            raise RuntimeError("HashMap changed during iteration")
+
+        part, index = self._index
+        while part < len(self._buckets):
+            buckets = self._buckets[part]
+            while index < len(buckets):
+                entry = buckets[index]
+                index += 1
+                if entry is None:
+                    continue
+
+                self._index = (part, index)
+                if self._view == 'keys':
+                    return entry.key
+                if self._view == 'values':
+                    return entry.value
+                if self._view == 'items':
+                    return entry.key, entry.value
+                return entry
+            part, index = part + 1, 0
+
+        self._index = (part, index)
+        raise StopIteration
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput, get and remove")
+    print("-------------------")
+    m = HashMap(22, hash_function_1, hash_function_2)
+    for i in range(40):
+        m.put('str' + str(i), i * 100)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2), m.get('str7'), m.contains_key('str40'))
+    for i in range(0, 40, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.get('str7'), m.get('str8'))
+
+    print("\nAnagrams that collide under hash_function_1")
+    print("-------------------------------------------")
+    m = HashMap(22, hash_function_1, 'fnv1a')
+    for key in ('listen', 'silent', 'enlist', 'tinsel', 'inlets'):
+        m.put(key, len(key))
+    print(m.get_size(), m.stats()['stashed'], m.get('tinsel'))
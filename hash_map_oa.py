@@ -7,85 +7,255 @@
 # with Quadratic Probing for collision resolution inside that dynamic array. Includes put(), get(), remove(),
 # contains_key(), clear(), empty_buckets(), resize_table(), table_load(), get_keys(), and find_mode() methods
 
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
+import heapq
+import itertools
+
+from a6_include import (DynamicArray, EntryIterator, HashEntry,
                         hash_function_1, hash_function_2)
+from capacity_policy import (check_load_limits, is_prime, mix_hash, next_power_of_two, next_prime,
+                             shrink_target)
+from hash_functions import get_hash_function
+from hash_vectorized import hash_many
+
+
+# Default number of pairs streamed or applied at a time by the chunked bulk operations
+CHUNK_SIZE = 4096
+
+
+# Placed in the old table when an entry migrates out of it, so probe sequences through that bucket stay intact
+_MIGRATED = HashEntry(None, None)
+_MIGRATED.is_tombstone = True
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, tombstone_threshold: float = 0.25,
+                 max_load: float = 0.5, min_load: float = 0.0625,
+                 grow_factor: float = 2.0, shrink_factor: float = 2.0,
+                 incremental: bool = False, migrate_buckets: int = 64, power_of_two: bool = False) -> None:
         """
         Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        quadratic probing for collision resolution.
+        The hash function may be given directly or by its name in the hash_functions registry.
+        The table is compacted in place once tombstones fill tombstone_threshold of the buckets.
+        It grows by grow_factor once the load reaches max_load (which must stay at or below 0.5 for quadratic
+        probing to always find a bucket) and shrinks by shrink_factor once the load drops below min_load, but
+        never below the starting capacity.
+        With incremental set, automatic resizes keep the old table around and every operation migrates at most
+        migrate_buckets of its buckets into the new one, instead of rehashing everything in a single call.
+        With power_of_two set, capacities are powers of two indexed with a bit mask, hashes pass through a
+        finalizer so their low bits are well mixed, and probing uses triangular steps, which visit every bucket
+        and so allow a max_load above 0.5.
         """
+        # Quadratic probing modulo a prime only reaches half of the buckets, so a higher load needs power-of-two mode
+        if max_load > 0.5 and not power_of_two:
+            raise ValueError("max_load above 0.5 requires power_of_two, since quadratic probing may miss free buckets")
+        check_load_limits(max_load, min_load, grow_factor, shrink_factor, below_one=True)
+
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number, or a power of two in power-of-two mode
+        self._power_of_two = power_of_two
+        self._capacity = self._round_capacity(capacity)
         for _ in range(self._capacity):
             self._buckets.append(None)
 
-        self._hash_function = function
+        self._hash_function = get_hash_function(function)
         self._size = 0
 
+        # Changes whenever entries are added, removed or moved, so iterators can detect it
+        self._version = 0
+
+        # Resize policy
+        self._max_load = max_load
+        self._min_load = min_load
+        self._grow_factor = grow_factor
+        self._shrink_factor = shrink_factor
+        self._min_capacity = self._capacity
+
+        # Removed entries stay behind as tombstones until the table is rebuilt
+        self._tombstones = 0
+        self._tombstone_threshold = tombstone_threshold
+        self._compactions = 0
+
+        # Incremental resizing; the old table is None unless a migration is in progress
+        self._incremental = incremental
+        self._migrate_buckets = migrate_buckets
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        # Number of live entries still waiting in the old table
+        self._old_size = 0
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_migration()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
         return out
 
-    def _next_prime(self, capacity: int) -> int:
+    def get_size(self) -> int:
         """
-        Increment from given number to find the closest prime number
+        Return size of map
         DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity % 2 == 0:
-            capacity += 1
+        return self._size
 
-        while not self._is_prime(capacity):
-            capacity += 2
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._capacity
 
-        return capacity
+    # ------------------------------------------------------------------ #
 
-    @staticmethod
-    def _is_prime(capacity: int) -> bool:
+    def _round_capacity(self, capacity: int) -> int:
         """
-        Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Rounds a capacity up to the next one allowed by the capacity mode
+
+        :param capacity: An integer representing the desired capacity
+
+        :return: An integer representing a prime capacity, or a power of two in power-of-two mode
         """
-        if capacity == 2 or capacity == 3:
-            return True
+        if self._power_of_two:
+            return next_power_of_two(capacity)
+        return next_prime(capacity)
 
-        if capacity == 1 or capacity % 2 == 0:
-            return False
+    def _home(self, hash: int, capacity: int) -> int:
+        """
+        Finds the first bucket of the probe sequence for a hash
 
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+        :param hash: An integer representing the hash of a key
+        :param capacity: An integer representing the capacity of the table being probed
 
-        return True
+        :return: An integer representing the index of the first bucket
+        """
+        if self._power_of_two:
+            return mix_hash(hash) & (capacity - 1)
+        return hash % capacity
 
-    def get_size(self) -> int:
+    def _probe(self, key: str, hash: int) -> (int, int):
         """
-        Return size of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Walks the probe sequence for a key. The walk returns as soon as the key is found and stops at the
+        first never-used bucket, since the key can not appear any further along the sequence.
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: A tuple of the index holding the live key (or -1 if absent) and the first index where the key could
+        be inserted (or -1 if the probe sequence has no free bucket)
         """
-        return self._size
+        free = -1
+        capacity = self._capacity
+        mask = capacity - 1 if self._power_of_two else 0
 
-    def get_capacity(self) -> int:
+        # The underlying list is indexed directly to skip the bounds checks of DynamicArray
+        buckets = self._buckets._data
+        index = self._home(hash, capacity)
+
+        for i in range(1, capacity + 1):
+            entry = buckets[index]
+
+            # A never-used bucket ends the probe sequence
+            if entry is None:
+                if free == -1:
+                    free = index
+                return -1, free
+
+            # Remember the first tombstone so an insert can reuse it
+            if entry.is_tombstone:
+                if free == -1:
+                    free = index
+
+            # Compare the cached hashes before the keys themselves
+            elif entry.hash == hash and entry.key == key:
+                return index, free
+
+            # Step to the next bucket: triangular offsets under the mask in power-of-two mode, quadratic offsets
+            # modulo the prime capacity otherwise
+            index = (index + i) & mask if mask else (hash + i * i) % capacity
+
+        return -1, free
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
         """
-        Return capacity of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Updates or adds a key/value pair whose hash has already been computed
+
+        :param key: A string representing the key in the key value pair
+        :param value: An object representing the object in the key value pair
+        :param hash: An integer representing the hash of the key
+
+        :return: None
         """
-        return self._capacity
+        self._setdefault_hashed(key, value, hash).value = value
 
-    # ------------------------------------------------------------------ #
+    def _increment(self, key: str, delta: int, hash: int) -> int:
+        """
+        Adds delta to the count stored under a key whose hash has already been computed, starting a missing key
+        at 0. The key is found or added in a single walk of its probe sequence, instead of a get() followed by a
+        put(). _setdefault_hashed() grows the table rather than come back without an entry, so one is always updated.
+
+        :param key: A string representing the key being counted
+        :param delta: An integer added to the count of the key
+        :param hash: An integer representing the hash of the key
+
+        :return: An integer representing the new count of the key
+        """
+        entry = self._setdefault_hashed(key, 0, hash)
+        entry.value += delta
+        return entry.value
+
+    def _setdefault_hashed(self, key: str, default: object, hash: int) -> HashEntry:
+        """
+        Finds the entry of a key whose hash has already been computed, adding the key with a default value if it is
+        not in the hash map
+
+        :param key: A string representing the key in the key value pair
+        :param default: An object representing the value stored if the key is added
+        :param hash: An integer representing the hash of the key
+
+        :return: The HashEntry holding the key
+        """
+        if self._old_buckets is not None:
+            self._migrate()
+
+        # Grow the table if the table load has reached the maximum load
+        if self.table_load() >= self._max_load:
+            self._rebuild(int(self._grow_factor * self._capacity))
+
+        # Tombstones also lengthen probe sequences, so drop them once live and dead entries reach the maximum load
+        elif self._occupied_load() >= self._max_load:
+            self._rebuild(self._capacity)
+            self._compactions += 1
+
+        index, free = self._probe(key, hash)
+
+        # A key that has not migrated yet is used where it is
+        if index == -1 and self._old_buckets is not None:
+            old_index = self._find_old(key, hash)
+            if old_index != -1:
+                return self._old_buckets[old_index]
+
+        # Check if the table contains the key
+        if index != -1:
+            return self._buckets[index]
+
+        # Otherwise add a new key/value pair and increment the size
+        if free != -1:
+            if self._buckets[free] is not None:
+                self._tombstones -= 1
+            entry = self._buckets[free] = HashEntry(key, default, hash)
+            self._size += 1
+            self._version += 1
+            return entry
+
+        # The probe sequence has no free bucket, so grow the table and try again rather than lose the key
+        self._rebuild(int(self._grow_factor * self._capacity))
+        return self._setdefault_hashed(key, default, hash)
 
     def put(self, key: str, value: object) -> None:
         """
@@ -97,25 +267,7 @@ class HashMap:
 
         :return: None
         """
-        # Resize the table to twice the capacity if the table load is greater than 1.0
-        if self.table_load() >= 0.5:
-            self.resize_table(2 * self._capacity)
-
-        for i in range(0, self._capacity):
-            # Initialize the hash and index
-            hash = self._hash_function(key)
-            index = (hash + i ** 2) % self._capacity
-
-            # Check if the table contains the key. If so update the value.
-            if self._buckets[index] is not None and self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-                self._buckets[index].value = value
-                return
-
-            # Otherwise add a new key/value pair and increment the size
-            elif self._buckets[index] is None or self._buckets[index].is_tombstone is True:
-                self._buckets[index] = HashEntry(key, value)
-                self._size += 1
-                return
+        self._put_hashed(key, value, self._hash_function(key))
 
     def table_load(self) -> float:
         """
@@ -128,15 +280,207 @@ class HashMap:
         # Use 𝝺 = n/m to calculate load
         return self._size / self._capacity
 
+    def _should_shrink(self) -> bool:
+        """
+        Determines if the table has dropped below the minimum load and can still shrink
+
+        :param: None
+
+        :return: A boolean representing if the table should shrink
+        """
+        return self._capacity > self._min_capacity and self.table_load() < self._min_load
+
+    def _occupied_load(self) -> float:
+        """
+        Calculates the load factor counting tombstones as well as live entries.
+
+        :param: None
+
+        :return: A float representing the fraction of buckets that are not empty
+        """
+        return (self._size + self._tombstones) / self._capacity
+
+    def get_tombstone_count(self) -> int:
+        """
+        Returns the number of tombstones currently in the hash table
+
+        :param: None
+
+        :return: An integer representing the number of tombstones
+        """
+        return self._tombstones
+
+    def get_compaction_count(self) -> int:
+        """
+        Returns the number of times the hash table has been compacted in place
+
+        :param: None
+
+        :return: An integer representing the number of compactions
+        """
+        return self._compactions
+
+    def compact(self) -> None:
+        """
+        Rebuilds the hash table at its current capacity, discarding every tombstone
+
+        :param: None
+
+        :return: None
+        """
+        self._resize(self._capacity)
+        self._compactions += 1
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Starts an automatic resize, migrating incrementally when the map was created with incremental set
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        if self._incremental:
+            self._start_migration(new_capacity)
+        else:
+            self._resize(new_capacity)
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        Swaps in an empty table at the new capacity and keeps the current one as the old table. The entries are
+        moved over a few buckets at a time by _migrate().
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        # Moving entries invalidates any iterator in use
+        self._version += 1
+
+        # Only one migration can be in progress at a time
+        self._finish_migration()
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._old_size = self._size
+        self._migrate_index = 0
+
+        self._capacity = self._fit_capacity(new_capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._tombstones = 0
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """
+        Moves the live entries of the next migrate_buckets buckets of the old table into the new table, dropping
+        the old table once every bucket has been moved
+
+        :param: None
+
+        :return: None
+        """
+        # Moving entries invalidates any iterator in use
+        self._version += 1
+
+        old_buckets = self._old_buckets._data
+        stop = min(self._migrate_index + self._migrate_buckets, self._old_capacity)
+        for i in range(self._migrate_index, stop):
+            entry = old_buckets[i]
+            if entry is not None and entry.is_tombstone is False:
+                self._place(entry)
+                old_buckets[i] = _MIGRATED
+                self._old_size -= 1
+
+        self._migrate_index = stop
+        if stop == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_migration(self) -> None:
+        """
+        Completes a migration in progress, if any
+
+        :param: None
+
+        :return: None
+        """
+        while self._old_buckets is not None:
+            self._migrate()
+
+    def _find_old(self, key: str, hash: int) -> int:
+        """
+        Walks the probe sequence of the old table during a migration
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: An integer representing the index of the live key in the old table, or -1 if it is not there
+        """
+        old_buckets = self._old_buckets._data
+        old_capacity = self._old_capacity
+        mask = old_capacity - 1 if self._power_of_two else 0
+        index = self._home(hash, old_capacity)
+        for i in range(1, old_capacity + 1):
+            entry = old_buckets[index]
+            if entry is None:
+                return -1
+            if entry.is_tombstone is False and entry.hash == hash and entry.key == key:
+                return index
+            index = (index + i) & mask if mask else (hash + i * i) % old_capacity
+        return -1
+
+    def _place(self, entry: HashEntry) -> None:
+        """
+        Puts an entry whose key is known not to be in the table into the first free bucket of its probe sequence
+
+        :param entry: A HashEntry with its hash cached
+
+        :return: None
+        """
+        # The underlying list is indexed directly to skip the bounds checks of DynamicArray
+        buckets = self._buckets._data
+        hash = entry.hash
+        capacity = self._capacity
+        mask = capacity - 1 if self._power_of_two else 0
+        i = 0
+        index = self._home(hash, capacity)
+        while buckets[index] is not None and buckets[index].is_tombstone is False:
+            i += 1
+            index = (index + i) & mask if mask else (hash + i * i) % capacity
+
+        if buckets[index] is not None:
+            self._tombstones -= 1
+        buckets[index] = entry
+
     def empty_buckets(self) -> int:
         """
-        Calculates the number of empty buckets in the hash table
+        Calculates the number of empty buckets in the hash table. Buckets holding tombstones are not empty. During
+        a migration this counts the buckets of the new table, which the keys still waiting in the old table do not
+        occupy yet.
 
         :param: None
 
         :return: An integer representing the number of empty buckets in the table
         """
-        return self._capacity - self._size
+        return self._capacity - (self._size - self._old_size) - self._tombstones
+
+    def stats(self) -> dict:
+        """
+        Reports the occupancy counters of the hash table, all maintained as the table changes
+
+        :param: None
+
+        :return: A dictionary of the size, capacity, load factor, empty buckets, live entries and tombstones in the
+        current table, compactions so far, and whether a migration is in progress
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'live_entries': self._size - self._old_size,
+            'tombstones': self._tombstones,
+            'compactions': self._compactions,
+            'migrating': self._old_buckets is not None,
+        }
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -150,24 +494,76 @@ class HashMap:
         if new_capacity < self._size:
             return
 
+        self._resize(new_capacity)
+
+        # An explicitly requested capacity becomes the floor for automatic shrinking
+        self._min_capacity = self._capacity
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Rebuilds the hash table at a new capacity in a single call
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        # Moving entries invalidates any iterator in use
+        self._version += 1
+
+        self._finish_migration()
+
         # Save the old hash map
         hash_map = self._buckets
 
-        # Update the desired capacity to a prime number
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
-
         # Set the capacity and clear the hash table
-        self._capacity = new_capacity
-        self._buckets = DynamicArray()
-        self._size = 0
-        for i in range(self._capacity):
-            self._buckets.append(None)
+        self._capacity = self._fit_capacity(new_capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._tombstones = 0
+
+        # Move the live entries into the new table using their cached hashes. Keys are known to be unique, so each
+        # entry goes straight into the first empty bucket of its probe sequence.
+        for entry in hash_map._data:
+            if entry is not None and entry.is_tombstone is False:
+                self._place(entry)
+
+    def _fit_capacity(self, new_capacity: int) -> int:
+        """
+        Rounds a desired capacity up to a prime, or a power of two in power-of-two mode, growing it until the entries
+        fit under the maximum load
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: An integer representing the capacity to use
+        """
+        if self._power_of_two:
+            new_capacity = next_power_of_two(new_capacity)
+        elif not is_prime(new_capacity):
+            new_capacity = next_prime(new_capacity)
+        while self._size > self._max_load * new_capacity:
+            new_capacity = self._round_capacity(int(self._grow_factor * new_capacity))
+        return new_capacity
+
+    def _find(self, key: str, hash: int) -> HashEntry:
+        """
+        Finds the live entry for a key whose hash has already been computed, looking in the old table as well
+        during a migration
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: The HashEntry holding the key, or None if the key doesn't exist
+        """
+        index, _ = self._probe(key, hash)
+        if index != -1:
+            return self._buckets[index]
+
+        # Look in the old table if the key may not have migrated yet
+        if self._old_buckets is not None:
+            index = self._find_old(key, hash)
+            if index != -1:
+                return self._old_buckets[index]
 
-        # Rehash the elements
-        for i in range(0, hash_map.length()):
-            if hash_map[i] is not None and hash_map[i].is_tombstone is False:
-                self.put(hash_map[i].key, hash_map[i].value)
+        return None
 
     def get(self, key: str) -> object:
         """
@@ -177,15 +573,13 @@ class HashMap:
 
         :return: An object representing the value corresponding to the found key or None if the key doesn't exist
         """
+        if self._old_buckets is not None:
+            self._migrate()
 
-        for i in range(0, self._capacity):
-            # Initialize hash and index
-            hash = self._hash_function(key)
-            index = (hash + i ** 2) % self._capacity
-
-            # Check if hashmap contains the key. Return the value if key is found
-            if self._buckets[index] is not None and self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-                return self._buckets[index].value
+        # Check if hashmap contains the key. Return the value if key is found
+        entry = self._find(key, self._hash_function(key))
+        if entry is not None:
+            return entry.value
 
         # Else return None
         return None
@@ -198,17 +592,10 @@ class HashMap:
 
         :return: A boolean representing if the key is found
         """
-        for i in range(0, self._capacity):
-            # Initialize hash and index
-            hash = self._hash_function(key)
-            index = (hash + i ** 2) % self._capacity
-
-            # Check if key is in the hashmap
-            if self._buckets[index] is not None and self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-                return True
+        if self._old_buckets is not None:
+            self._migrate()
 
-        # Else return False
-        return False
+        return self._find(key, self._hash_function(key)) is not None
 
     def remove(self, key: str) -> None:
         """
@@ -219,16 +606,172 @@ class HashMap:
 
         :return: None
         """
-        for i in range(0, self._capacity):
-            # Initialize hash and index
-            hash = self._hash_function(key)
-            index = (hash + i ** 2) % self._capacity
+        if self._old_buckets is not None:
+            self._migrate()
+
+        if self._remove_hashed(key, self._hash_function(key)):
+            self._shrink_or_compact()
 
-            # Set Tombstone to True if found otherwise do nothing
-            if self._buckets[index] is not None and self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-                self._buckets[index].is_tombstone = True
-                self._size -= 1
-        return
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """
+        Tombstones the entry for a key whose hash has already been computed
+
+        :param key: A string representing the key to remove
+        :param hash: An integer representing the hash of the key
+
+        :return: A boolean representing if the key was found and removed
+        """
+        index, _ = self._probe(key, hash)
+
+        # Set Tombstone to True if found
+        if index != -1:
+            self._buckets[index].is_tombstone = True
+            self._tombstones += 1
+
+        # A key that has not migrated yet is removed from the old table, which is discarded with its tombstones
+        else:
+            if self._old_buckets is None:
+                return False
+            index = self._find_old(key, hash)
+            if index == -1:
+                return False
+            self._old_buckets[index].is_tombstone = True
+            self._old_size -= 1
+
+        self._size -= 1
+        self._version += 1
+        return True
+
+    def _shrink_or_compact(self) -> None:
+        """
+        Shrinks the table if the load has dropped below the minimum load, which also drops the tombstones, and
+        otherwise rebuilds it in place once the tombstones pass the threshold
+
+        :param: None
+
+        :return: None
+        """
+        if self._should_shrink():
+            self._rebuild(shrink_target(self._capacity, self._size, self._min_capacity, self._min_load,
+                                        self._shrink_factor))
+
+        elif self._tombstones >= self._tombstone_threshold * self._capacity:
+            self._rebuild(self._capacity)
+            self._compactions += 1
+
+    def put_many(self, pairs) -> None:
+        """
+        Updates or adds every key/value pair in a dynamic array. Into an empty map the table is resized once up
+        front for all the distinct keys, so none of the individual insertions has to grow it; otherwise it grows as
+        the keys are added, like put().
+        Any other iterable of pairs, such as the items() or iter_chunks() of another map, is consumed a chunk at a
+        time, so it is never copied in full.
+
+        :param pairs: A DynamicArray of (key, value) tuples, or an iterable of (key, value) tuples or of such
+        DynamicArray chunks
+
+        :return: None
+        """
+        if isinstance(pairs, DynamicArray):
+            # The underlying list is read directly to skip the bounds checks of DynamicArray
+            self._put_pairs(pairs._data)
+            return
+
+        pairs = iter(pairs)
+        first = next(pairs, None)
+        if first is None:
+            return
+
+        # Flatten chunks coming from iter_chunks() lazily, so no more than one chunk of pairs is held at a time
+        pairs = itertools.chain((first,), pairs)
+        if isinstance(first, DynamicArray):
+            pairs = itertools.chain.from_iterable(array._data for array in pairs)
+
+        chunk = list(itertools.islice(pairs, CHUNK_SIZE))
+        while chunk:
+            self._put_pairs(chunk)
+            chunk = list(itertools.islice(pairs, CHUNK_SIZE))
+
+    def _put_pairs(self, pairs: list) -> None:
+        """
+        Updates or adds every key/value pair in a list, presizing an empty table once for all of them
+
+        :param pairs: A list of (key, value) tuples
+
+        :return: None
+        """
+        # Hash every key in one pass
+        keys = [key for key, _ in pairs]
+        hashes = hash_many(self._hash_function, keys)
+
+        # Only into an empty map is every distinct key known to be new. Presizing a filled map for the whole batch
+        # would grow it even when the pairs only update existing keys, so there the usual growth is left to act.
+        if self._size == 0:
+            needed = int(len(set(keys)) / self._max_load) + 1
+            if needed > self._capacity:
+                self._rebuild(needed)
+
+        put_hashed = self._put_hashed
+        for (key, value), hash in zip(pairs, hashes):
+            put_hashed(key, value, hash)
+
+    def get_many(self, keys: DynamicArray) -> DynamicArray:
+        """
+        Finds the value of every key in a dynamic array
+
+        :param keys: A DynamicArray of keys to find
+
+        :return: A DynamicArray holding, at each index, the value of the matching key or None if it doesn't exist
+        """
+        keys = keys._data
+        hashes = hash_many(self._hash_function, keys)
+
+        values = []
+        for key, hash in zip(keys, hashes):
+            if self._old_buckets is not None:
+                self._migrate()
+            entry = self._find(key, hash)
+            values.append(entry.value if entry is not None else None)
+        return DynamicArray(values)
+
+    def contains_many(self, keys: DynamicArray) -> DynamicArray:
+        """
+        Determines if each key in a dynamic array is in the hash table
+
+        :param keys: A DynamicArray of keys to find
+
+        :return: A DynamicArray holding, at each index, a boolean representing if the matching key is found
+        """
+        keys = keys._data
+        hashes = hash_many(self._hash_function, keys)
+
+        found = []
+        for key, hash in zip(keys, hashes):
+            if self._old_buckets is not None:
+                self._migrate()
+            found.append(self._find(key, hash) is not None)
+        return DynamicArray(found)
+
+    def remove_many(self, keys: DynamicArray) -> None:
+        """
+        Removes every key in a dynamic array from the hash map, skipping keys that don't exist. The table is
+        shrunk or compacted at most once, after all the removals.
+
+        :param keys: A DynamicArray of keys to remove
+
+        :return: None
+        """
+        keys = keys._data
+        hashes = hash_many(self._hash_function, keys)
+
+        removed = False
+        for key, hash in zip(keys, hashes):
+            if self._old_buckets is not None:
+                self._migrate()
+            removed |= self._remove_hashed(key, hash)
+
+        if removed:
+            self._shrink_or_compact()
 
     def clear(self) -> None:
         """
@@ -238,12 +781,17 @@ class HashMap:
 
         :return: None
         """
-        # Reinitialize buckets to None
+        self._version += 1
+
+        # Reinitialize buckets to None and drop any table still being migrated
         for i in range(0, self._capacity):
             self._buckets[i] = None
+        self._old_buckets = None
+        self._old_size = 0
 
-        # Reset size to zero
+        # Reset size and tombstones to zero
         self._size = 0
+        self._tombstones = 0
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -255,6 +803,8 @@ class HashMap:
         :return: A Dynamic array in which each index contains a tuple of a key/value pair
         stored in the hash map
         """
+        self._finish_migration()
+
         # Create a new Dynamic Array to return
         return_array = DynamicArray()
 
@@ -264,27 +814,137 @@ class HashMap:
                 return_array.append((self._buckets[i].key, self._buckets[i].value))
         return return_array
 
-    def __iter__(self):
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE):
         """
-        TODO: Write this implementation
+        Streams the key/value pairs of the hash map in dynamic arrays of at most chunk_size tuples, so a large map
+        can be written out in batches without building one array of every pair
+
+        :param chunk_size: An integer representing the most pairs in each chunk
+
+        :return: A generator of DynamicArrays of (key, value) tuples
+        """
+        chunk = []
+        for item in self.items():
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield DynamicArray(chunk)
+                chunk = []
+
+        if chunk:
+            yield DynamicArray(chunk)
+
+    def __iter__(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the live HashEntry objects in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding HashEntry objects
         """
-        self._index = 0
+        return HashMapIterator(self, 'entries')
 
-        return self
+    def keys(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the keys in the hash map
+
+        :param: None
 
-    def __next__(self):
+        :return: A HashMapIterator yielding keys
         """
-        TODO: Write this implementation
+        return HashMapIterator(self, 'keys')
+
+    def values(self) -> "HashMapIterator":
         """
+        Returns an iterator over the values in the hash map
 
-        if self._buckets[self._index] is not None:
-            try:
-                value = self._buckets[self._index]
-            except DynamicArrayException:
-                raise StopIteration
+        :param: None
 
-        self._index += 1
-        return value
+        :return: A HashMapIterator yielding values
+        """
+        return HashMapIterator(self, 'values')
+
+    def items(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the key/value pairs in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding (key, value) tuples
+        """
+        return HashMapIterator(self, 'items')
+
+
+class HashMapIterator(EntryIterator):
+    """
+    Separate iterator class for HashMap. Each iterator keeps its own position, so several can walk the same map
+    at once. Adding, removing or moving entries while an iterator is in use makes it raise RuntimeError.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, hash_map: HashMap, view: str) -> None:
+        """
+        Initialize the iterator at the first bucket of a map
+
+        :param hash_map: The HashMap to iterate over
+        :param view: A string selecting what is yielded: 'entries', 'keys', 'values' or 'items'
+        """
+        # Every entry has to be in the current table before it can be walked
+        hash_map._finish_migration()
+        super().__init__(hash_map, view)
+
+
+class CounterMap(HashMap):
+    """
+    Open Addressing HashMap specialized for counting. Every value is an integer count, and each increment hashes its key
+    once and walks its probe sequence once, instead of a get() followed by a put().
+    """
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the count of a key, starting a missing key at 0
+
+        :param key: A string representing the key being counted
+        :param delta: An integer added to the count of the key
+
+        :return: An integer representing the new count of the key
+        """
+        return self._increment(key, delta, self._hash_function(key))
+
+    def update_from(self, keys) -> None:
+        """
+        Counts every key of an iterable once. The keys are hashed a chunk at a time in one pass each.
+
+        :param keys: A DynamicArray or any other iterable of strings
+
+        :return: None
+        """
+        # The underlying list is read directly to skip the bounds checks of DynamicArray
+        if isinstance(keys, DynamicArray):
+            keys = keys._data
+
+        keys = iter(keys)
+        increment = self._increment
+        chunk = list(itertools.islice(keys, CHUNK_SIZE))
+        while chunk:
+            for key, hash in zip(chunk, hash_many(self._hash_function, chunk)):
+                increment(key, 1, hash)
+            chunk = list(itertools.islice(keys, CHUNK_SIZE))
+
+    def most_common(self, n: int = None) -> DynamicArray:
+        """
+        Finds the n keys with the highest counts. A heap of at most n counts picks them, so ranking d keys takes
+        O(d log n).
+
+        :param n: An integer representing the number of keys returned, or None to rank every key
+
+        :return: A DynamicArray of (key, count) tuples, highest count first
+        """
+        if n is None:
+            return DynamicArray(sorted(self.items(), key=lambda item: item[1], reverse=True))
+        if n <= 0:
+            return DynamicArray()
+        return DynamicArray(heapq.nlargest(n, self.items(), key=lambda item: item[1]))
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -476,6 +1136,26 @@ if __name__ == "__main__":
     m.resize_table(12)
     print(m.get_keys_and_values())
 
+    print("\nIncremental resize example 1")
+    print("----------------------------")
+    m = HashMap(11, hash_function_1, incremental=True, migrate_buckets=1)
+    for i in range(7):
+        m.put('key' + str(i), i * 10)
+    # The last put started a migration, and only one bucket of the old table has moved so far
+    stats = m.stats()
+    print(stats['migrating'], stats['size'], stats['live_entries'], m.empty_buckets(), m.get_capacity())
+    # Keys still waiting in the old table are found, updated and removed there
+    print(m.get('key0'), m.get('key5'), m.contains_key('key3'), m.get('key20'))
+    m.remove('key1')
+    m.remove('key4')
+    m.put('key3', 99)
+    print(m.get('key1'), m.get('key3'), m.get_size())
+    # Every operation moves one more bucket until the old table is gone
+    while m.stats()['migrating']:
+        m.get('key0')
+    stats = m.stats()
+    print(stats['migrating'], stats['size'], stats['live_entries'], m.get_keys_and_values())
+
     print("\nPDF - __iter__(), __next__() example 1")
     print("---------------------")
     m = HashMap(10, hash_function_1)
@@ -495,3 +1175,51 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nIterator example 1")
+    print("------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(4):
+        m.put('key' + str(i), i)
+    print(sorted(m.keys()), sorted(m.values()), sorted(m.items()))
+    # Every iterator keeps its own position, so two can walk the map at once
+    first, second = iter(m), iter(m)
+    print(next(first).key, next(first).key, next(second).key, len(list(second)))
+
+    print("\nIterator example 2")
+    print("------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(4):
+        m.put('key' + str(i), i)
+    # Updating the value of an existing key leaves an iterator usable
+    keys = m.keys()
+    next(keys)
+    m.put('key0', 100)
+    print(len(list(keys)), m.get('key0'))
+    # Adding or removing a key makes it fail on its next step
+    keys = m.keys()
+    next(keys)
+    m.put('key4', 4)
+    try:
+        next(keys)
+    except RuntimeError as error:
+        print('RuntimeError:', error)
+    items = m.items()
+    m.remove('key4')
+    try:
+        next(items)
+    except RuntimeError as error:
+        print('RuntimeError:', error)
+
+    print("\nCounterMap example 1")
+    print("--------------------")
+    m = CounterMap(11, hash_function_1)
+    m.update_from(DynamicArray(["red", "blue", "red", "green", "red", "blue"]))
+    print(m.increment("green", 2), m.increment("yellow"), m.get("red"))
+    print(m.most_common(2))
+
+    print("\nCounterMap example 2")
+    print("--------------------")
+    m = CounterMap(11, hash_function_2, max_load=0.9, min_load=0.1, power_of_two=True)
+    m.update_from('key' + str(i % 1500) for i in range(3000))
+    print(m.get_size(), m.get('key0'), m.get('key1499'), round(m.table_load(), 2))
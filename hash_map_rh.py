@@ -0,0 +1,411 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: HashMap using Open Addressing with Robin Hood linear probing, a drop-in alternative to the quadratic
+# probing map in hash_map_oa. An insert takes the bucket of any entry that sits closer to its home bucket than the
+# new entry would, which keeps every probe sequence short and evenly spread even at loads around 0.9. Removals
+# shift the following entries back one bucket instead of leaving tombstones.
+
+from a6_include import DynamicArray, EntryIterator, HashEntry, hash_function_1
+from capacity_policy import check_load_limits, is_prime, next_prime, shrink_target
+from hash_functions import get_hash_function
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_load: float = 0.9, min_load: float = 0.1,
+                 grow_factor: float = 2.0, shrink_factor: float = 2.0) -> None:
+        """
+        Initialize new HashMap that uses
+        Robin Hood linear probing for collision resolution.
+        The hash function may be given directly or by its name in the hash_functions registry.
+        The table grows by grow_factor once the load reaches max_load and shrinks by shrink_factor once the load
+        drops below min_load, but never below the starting capacity.
+        """
+        check_load_limits(max_load, min_load, grow_factor, shrink_factor, below_one=True)
+
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+
+        self._hash_function = get_hash_function(function)
+        self._size = 0
+
+        # Changes whenever entries are added, removed or moved, so iterators can detect it
+        self._version = 0
+
+        # Resize policy
+        self._max_load = max_load
+        self._min_load = min_load
+        self._grow_factor = grow_factor
+        self._shrink_factor = shrink_factor
+        self._min_capacity = self._capacity
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find_index(self, key: str, hash: int) -> int:
+        """
+        Walks the probe sequence for a key. The walk stops at an empty bucket or at the first entry that is closer to
+        its home bucket than the key would be, since Robin Hood insertion would have placed the key before it.
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: An integer representing the index holding the key, or -1 if the key doesn't exist
+        """
+        capacity = self._capacity
+
+        # The underlying list is indexed directly to skip the bounds checks of DynamicArray
+        buckets = self._buckets._data
+        index = hash % capacity
+        distance = 0
+
+        while True:
+            entry = buckets[index]
+            if entry is None or (index - entry.hash) % capacity < distance:
+                return -1
+
+            # Compare the cached hashes before the keys themselves
+            if entry.hash == hash and entry.key == key:
+                return index
+
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key exists it updates the value, otherwise it adds a new
+        key/value pair
+
+        :param key: A string representing the key in the key value pair
+        :param value: An object representing the object in the key value pair
+
+        :return: None
+        """
+        # Grow the table if adding a key would take the load past the maximum load
+        if self._size + 1 > self._max_load * self._capacity:
+            self._resize(int(self._grow_factor * self._capacity))
+
+        hash = self._hash_function(key)
+        capacity = self._capacity
+        buckets = self._buckets._data
+        index = hash % capacity
+        distance = 0
+
+        # Walk the probe sequence until the key, an empty bucket or an entry closer to its home bucket is found
+        while True:
+            entry = buckets[index]
+            if entry is None:
+                buckets[index] = HashEntry(key, value, hash)
+                break
+
+            entry_distance = (index - entry.hash) % capacity
+            if entry_distance < distance:
+                # The key is not in the table. It takes this bucket and the entry it displaces moves on.
+                buckets[index] = HashEntry(key, value, hash)
+                self._place(entry, index + 1, entry_distance + 1)
+                break
+
+            if entry.hash == hash and entry.key == key:
+                entry.value = value
+                return
+
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+        self._size += 1
+        self._version += 1
+
+    def _place(self, entry: HashEntry, index: int, distance: int) -> None:
+        """
+        Puts an entry whose key is known not to be in the table into the table, starting part way along its probe
+        sequence. Every entry that sits closer to its home bucket than the one being placed is swapped out and placed
+        further along in turn, so no keys are compared.
+
+        :param entry: A HashEntry with its hash cached
+        :param index: An integer representing the first index to try, which may equal the capacity
+        :param distance: An integer representing how far that index is from the home bucket of the entry
+
+        :return: None
+        """
+        capacity = self._capacity
+        buckets = self._buckets._data
+        if index == capacity:
+            index = 0
+
+        while True:
+            current = buckets[index]
+            if current is None:
+                buckets[index] = entry
+                return
+
+            current_distance = (index - current.hash) % capacity
+            if current_distance < distance:
+                buckets[index], entry = entry, current
+                distance = current_distance
+
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+    def table_load(self) -> float:
+        """
+        Calculates the current hash table load factor.
+
+        :param: None
+
+        :return: A float representing the table load factor.
+        """
+        # Use 𝝺 = n/m to calculate load
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Finds the number of empty buckets in the hash table. Without tombstones every bucket not holding an entry is
+        empty.
+
+        :param: None
+
+        :return: An integer representing the number of empty buckets in the table
+        """
+        return self._capacity - self._size
+
+    def stats(self) -> dict:
+        """
+        Reports the occupancy counters of the hash table
+
+        :param: None
+
+        :return: A dictionary of the size, capacity, load factor and empty buckets of the table
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+        }
+
+    def probe_lengths(self) -> DynamicArray:
+        """
+        Finds how far every entry sits from its home bucket. A lookup of a key walks one bucket more than its
+        distance.
+
+        :param: None
+
+        :return: A DynamicArray of integers, one per entry, in bucket order
+        """
+        capacity = self._capacity
+        return DynamicArray([(index - entry.hash) % capacity
+                             for index, entry in enumerate(self._buckets._data) if entry is not None])
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table while maintaining and rehashing the existing key/value pairs
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        # Do nothing if the desired capacity is less than the table size
+        if new_capacity < self._size:
+            return
+
+        self._resize(new_capacity)
+
+        # An explicitly requested capacity becomes the floor for automatic shrinking
+        self._min_capacity = self._capacity
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Rebuilds the hash table at a new capacity in a single call
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        self._version += 1
+        entries = self._buckets._data
+
+        # Round the capacity up to a prime, growing it until the entries fit under the maximum load
+        if not is_prime(new_capacity):
+            new_capacity = next_prime(new_capacity)
+        while self._size > self._max_load * new_capacity:
+            new_capacity = next_prime(int(self._grow_factor * new_capacity))
+
+        self._capacity = new_capacity
+        self._buckets = DynamicArray([None] * new_capacity)
+
+        # Place the existing entries using their cached hashes. Keys are known to be unique, so no key is compared.
+        for entry in entries:
+            if entry is not None:
+                self._place(entry, entry.hash % new_capacity, 0)
+
+    def get(self, key: str) -> object:
+        """
+        Finds the value in the hash table when passed a key
+
+        :param key: A string representing the key to find in the hash table
+
+        :return: An object representing the value corresponding to the found key or None if the key doesn't exist
+        """
+        index = self._find_index(key, self._hash_function(key))
+        if index == -1:
+            return None
+        return self._buckets._data[index].value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Determines is a given key is in the hash table
+
+        :param key: A string representing the key to find
+
+        :return: A boolean representing if the key is found
+        """
+        return self._find_index(key, self._hash_function(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map,
+        otherwise does nothing if the key doesn't exist.
+
+        :param key: A string representing the key to find
+
+        :return: None
+        """
+        index = self._find_index(key, self._hash_function(key))
+        if index == -1:
+            return
+
+        # Shift every following entry that is away from its home bucket back by one, which closes the gap without
+        # leaving a tombstone
+        capacity = self._capacity
+        buckets = self._buckets._data
+        following = index + 1 if index + 1 < capacity else 0
+        entry = buckets[following]
+        while entry is not None and (following - entry.hash) % capacity != 0:
+            buckets[index] = entry
+            index = following
+            following = index + 1 if index + 1 < capacity else 0
+            entry = buckets[following]
+        buckets[index] = None
+
+        self._size -= 1
+        self._version += 1
+
+        # Shrink the table once the load drops below the minimum load
+        if self._capacity > self._min_capacity and self.table_load() < self._min_load:
+            self._resize(shrink_target(self._capacity, self._size, self._min_capacity, self._min_load,
+                                       self._shrink_factor))
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map while maintaining the capacity.
+
+        :param: None
+
+        :return: None
+        """
+        self._version += 1
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map
+
+        :param: None
+
+        :return: A Dynamic array in which each index contains a tuple of a key/value pair
+        stored in the hash map
+        """
+        return DynamicArray([(entry.key, entry.value) for entry in self._buckets._data if entry is not None])
+
+    def __iter__(self) -> "EntryIterator":
+        """
+        Returns an iterator over the HashEntry objects in the hash map
+
+        :param: None
+
+        :return: A EntryIterator yielding HashEntry objects
+        """
+        return EntryIterator(self, 'entries')
+
+    def keys(self) -> "EntryIterator":
+        """
+        Returns an iterator over the keys in the hash map
+
+        :param: None
+
+        :return: A EntryIterator yielding keys
+        """
+        return EntryIterator(self, 'keys')
+
+    def values(self) -> "EntryIterator":
+        """
+        Returns an iterator over the values in the hash map
+
+        :param: None
+
+        :return: A EntryIterator yielding values
+        """
+        return EntryIterator(self, 'values')
+
+    def items(self) -> "EntryIterator":
+        """
+        Returns an iterator over the key/value pairs in the hash map
+
+        :param: None
+
+        :return: A EntryIterator yielding (key, value) tuples
+        """
+        return EntryIterator(self, 'items')
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput, get and remove")
+    print("-------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(40):
+        m.put('str' + str(i), i * 100)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2), m.get('str7'), m.contains_key('str40'))
+    for i in range(0, 40, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.get('str7'), m.get('str8'))
+
+    print("\nProbe lengths at a load of 0.9")
+    print("------------------------------")
+    m = HashMap(1117, 'fnv1a')
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    lengths = m.probe_lengths()
+    print(m.get_capacity(), round(m.table_load(), 2),
+          max(lengths[i] for i in range(lengths.length())),
+          sum(lengths[i] for i in range(lengths.length())) / lengths.length())
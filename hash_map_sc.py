@@ -5,75 +5,88 @@
 # Due Date: 12/2/2022
 # Description: Implement the HashMap class using a dynamic array to store the hash table and chaining for collision
 # resolution using a singly linked list. Includes put(), get(), remove(), contains_key(), clear(), empty_buckets(),
-# resize_table(), table_load(), get_keys(), and find_mode() methods
+# resize_table(), table_load(), get_keys(), find_mode() and top_k() methods
 
 
-from a6_include import (DynamicArray, LinkedList,
+import heapq
+import itertools
+
+from a6_include import (DynamicArray, LinkedList, SLNode, SortedBucket,
                         hash_function_1, hash_function_2)
+from capacity_policy import check_load_limits, is_prime, next_prime, shrink_target
+from hash_functions import get_hash_function
+from hash_vectorized import hash_many
+
+
+# Default number of pairs streamed or applied at a time by the chunked bulk operations
+CHUNK_SIZE = 4096
+
+# A chain longer than this becomes a SortedBucket, searched by binary search, and turns back into a LinkedList
+# once it drops below UNTREEIFY_THRESHOLD. The gap keeps a bucket from converting back and forth. Below about a
+# dozen nodes walking the chain is still faster than the binary search.
+TREEIFY_THRESHOLD = 12
+UNTREEIFY_THRESHOLD = 8
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 max_load: float = 1.0,
+                 min_load: float = 0.125,
+                 grow_factor: float = 2.0,
+                 shrink_factor: float = 2.0,
+                 incremental: bool = False,
+                 migrate_buckets: int = 64) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        The hash function may be given directly or by its name in the hash_functions registry.
+        The table grows by grow_factor once the load reaches max_load and shrinks by shrink_factor once the load
+        drops below min_load, but never below the starting capacity.
+        With incremental set, automatic resizes keep the old table around and every operation migrates at most
+        migrate_buckets of its buckets into the new one, instead of rehashing everything in a single call.
         """
-        self._buckets = DynamicArray()
+        check_load_limits(max_load, min_load, grow_factor, shrink_factor)
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        # capacity must be a prime number; a bucket stays None until its first insert
+        self._capacity = next_prime(capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
 
-        self._hash_function = function
+        self._hash_function = get_hash_function(function)
         self._size = 0
 
+        # Changes whenever entries are added, removed or moved, so iterators can detect it
+        self._version = 0
+
+        # Number of non-empty buckets in the current table
+        self._occupied = 0
+
+        # Resize policy
+        self._max_load = max_load
+        self._min_load = min_load
+        self._grow_factor = grow_factor
+        self._shrink_factor = shrink_factor
+        self._min_capacity = self._capacity
+
+        # Incremental resizing; the old table is None unless a migration is in progress
+        self._incremental = incremental
+        self._migrate_buckets = migrate_buckets
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_migration()
         out = ''
         for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+            bucket = self._buckets[i] if self._buckets[i] is not None else LinkedList()
+            out += str(i) + ': ' + str(bucket) + '\n'
         return out
 
-    def _next_prime(self, capacity: int) -> int:
-        """
-        Increment from given number and the find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
-
-    @staticmethod
-    def _is_prime(capacity: int) -> bool:
-        """
-        Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
-
     def get_size(self) -> int:
         """
         Return size of map
@@ -100,41 +113,108 @@ class HashMap:
 
         :return: None
         """
-        # Resize the table to twice the capacity if the table load is greater than 1.0
-        if self.table_load() >= 1.0:
-            self.resize_table(2 * self._capacity)
+        self._put_hashed(key, value, self._hash_function(key))
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Updates or adds a key/value pair whose hash has already been computed
+
+        :param key: A string representing the key in the key value pair
+        :param value: An object representing the object in the key value pair
+        :param hash: An integer representing the hash of the key
+
+        :return: None
+        """
+        self._setdefault_hashed(key, value, hash).value = value
 
-        # Initialize the hash and index
-        hash = self._hash_function(key)
+    def _increment(self, key: str, delta: int, hash: int) -> int:
+        """
+        Adds delta to the count stored under a key whose hash has already been computed, starting a missing key
+        at 0. The key is found or added in a single walk of its chain, instead of a get() followed by a put().
+
+        :param key: A string representing the key being counted
+        :param delta: An integer added to the count of the key
+        :param hash: An integer representing the hash of the key
+
+        :return: An integer representing the new count of the key
+        """
+        node = self._setdefault_hashed(key, 0, hash)
+        node.value += delta
+        return node.value
+
+    def _setdefault_hashed(self, key: str, default: object, hash: int) -> SLNode:
+        """
+        Finds the node of a key whose hash has already been computed, adding the key with a default value if it is
+        not in the hash map
+
+        :param key: A string representing the key in the key value pair
+        :param default: An object representing the value stored if the key is added
+        :param hash: An integer representing the hash of the key
+
+        :return: The SLNode holding the key
+        """
+        if self._old_buckets is not None:
+            self._migrate()
+
+        # Grow the table if the table load has reached the maximum load
+        if self.table_load() >= self._max_load:
+            self._rebuild(int(self._grow_factor * self._capacity))
+
+        # During a migration the key may still be waiting in the old table. A key lives in only one of the two
+        # tables, so its node there is used if found.
+        if self._old_buckets is not None:
+            node = self._find_old(key, hash)
+            if node:
+                return node
+
+        # Initialize the index. The underlying list is indexed directly to skip the bounds checks of DynamicArray.
+        buckets = self._buckets._data
         index = hash % self._capacity
+        bucket = buckets[index]
 
-        # Check if the table contains the key. If so update the value.
-        if self._buckets[index].contains(key):
-            self._buckets[index].contains(key).value = value
+        # Allocate the bucket on its first insert
+        if bucket is None:
+            bucket = buckets[index] = LinkedList()
+            self._occupied += 1
 
-        # Otherwise add a new key/value pair and increment the size
-        else:
-            self._buckets[index].insert(key, value)
+        # Find the node if the key exists, otherwise add a new node and increment the size, all in one walk of the
+        # chain
+        node, inserted = bucket.setdefault(key, default, hash)
+        if inserted:
             self._size += 1
+            self._version += 1
+            if bucket.length() > TREEIFY_THRESHOLD and type(bucket) is LinkedList:
+                buckets[index] = SortedBucket(bucket)
+        return node
 
     def empty_buckets(self) -> int:
         """
-        Finds the number of empty buckets in the hash table
+        Finds the number of empty buckets in the hash table. During a migration this counts the buckets of the
+        new table, which the keys still waiting in the old table do not occupy yet.
 
         :param: None
 
         :return: An integer representing the number of empty buckets in the table
         """
-        # Initialize the counter
-        count = 0
+        return self._capacity - self._occupied
 
-        # Increment the counter once an empty bucket is found
-        for i in range(0, self._capacity):
-            if self._buckets[i].length() == 0:
-                count += 1
+    def stats(self) -> dict:
+        """
+        Reports the occupancy counters of the hash table, all maintained as the table changes
+
+        :param: None
 
-        # Return the counter
-        return count
+        :return: A dictionary of the size, capacity, load factor, empty and occupied buckets, and whether a
+        migration is in progress
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'occupied_buckets': self._occupied,
+            'migrating': self._old_buckets is not None,
+        }
 
     def table_load(self) -> float:
         """
@@ -147,6 +227,16 @@ class HashMap:
         # Use 𝝺 = n/m to calculate load
         return self._size / self._capacity
 
+    def _should_shrink(self) -> bool:
+        """
+        Determines if the table has dropped below the minimum load and can still shrink
+
+        :param: None
+
+        :return: A boolean representing if the table should shrink
+        """
+        return self._capacity > self._min_capacity and self.table_load() < self._min_load
+
     def clear(self) -> None:
         """
         Clears the contents of the hash map while maintaining the capacity.
@@ -155,12 +245,15 @@ class HashMap:
 
         :return: None
         """
-        # Reinitialize buckets to an empty linked list
-        for i in range(0, self._capacity):
-            self._buckets[i] = LinkedList()
+        self._version += 1
+
+        # Empty every bucket and drop any table still being migrated
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._old_buckets = None
 
-        # Reset size to zero
+        # Reset size and occupied buckets to zero
         self._size = 0
+        self._occupied = 0
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -174,24 +267,180 @@ class HashMap:
         if new_capacity < 1:
             return
 
+        self._resize(new_capacity)
+
+        # An explicitly requested capacity becomes the floor for automatic shrinking
+        self._min_capacity = self._capacity
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Rebuilds the hash table at a new capacity in a single call
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        # Moving entries invalidates any iterator in use
+        self._version += 1
+
+        self._finish_migration()
+
         # Save the old hash map
         hash_map = self._buckets
 
-        # Update the desired capacity to a prime number
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
-
         # Set the capacity and clear the hash table
-        self._capacity = new_capacity
-        self._buckets = DynamicArray()
-        self._size = 0
-        for i in range(self._capacity):
-            self._buckets.append(LinkedList())
+        self._capacity = self._fit_capacity(new_capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._occupied = 0
+
+        # Relink the existing nodes into the new buckets using their cached hashes. Keys are known to be unique, so
+        # no duplicate check or new node is needed.
+        for bucket in hash_map._data:
+            self._relink(bucket)
+
+    def _fit_capacity(self, new_capacity: int) -> int:
+        """
+        Rounds a desired capacity up to a prime, growing it until the entries fit under the maximum load
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: An integer representing the capacity to use
+        """
+        if not is_prime(new_capacity):
+            new_capacity = next_prime(new_capacity)
+        while self._size > self._max_load * new_capacity:
+            new_capacity = next_prime(int(self._grow_factor * new_capacity))
+        return new_capacity
+
+    def _relink(self, bucket: LinkedList) -> None:
+        """
+        Moves every node of a bucket from another table into its bucket in this table
+
+        :param bucket: A LinkedList or SortedBucket whose nodes carry cached hashes, or None for an empty bucket
+
+        :return: None
+        """
+        if bucket is None:
+            return
+
+        # The underlying list is indexed directly to skip the bounds checks of DynamicArray
+        buckets = self._buckets._data
+
+        # The iterator steps past a node before it is relinked, so moving it is safe
+        for node in bucket:
+            index = node.hash % self._capacity
+            if buckets[index] is None:
+                buckets[index] = LinkedList()
+                self._occupied += 1
+            buckets[index].insert_node(node)
+            if buckets[index].length() > TREEIFY_THRESHOLD and type(buckets[index]) is LinkedList:
+                buckets[index] = SortedBucket(buckets[index])
+
+    def _rebuild(self, new_capacity: int) -> None:
+        """
+        Starts an automatic resize, migrating incrementally when the map was created with incremental set
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        if self._incremental:
+            self._start_migration(new_capacity)
+        else:
+            self._resize(new_capacity)
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        Swaps in an empty table at the new capacity and keeps the current one as the old table. The nodes are
+        moved over a few buckets at a time by _migrate().
+
+        :param new_capacity: An integer representing desired capacity for the hash table
 
-        # Rehash the elements
-        for i in range(0, hash_map.length()):
-            for j in hash_map[i]:
-                self.put(j.key, j.value)
+        :return: None
+        """
+        # Moving entries invalidates any iterator in use
+        self._version += 1
+
+        # Only one migration can be in progress at a time
+        self._finish_migration()
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._migrate_index = 0
+
+        self._capacity = self._fit_capacity(new_capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._occupied = 0
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """
+        Moves the nodes of the next migrate_buckets buckets of the old table into the new table, dropping the old
+        table once every bucket has been moved
+
+        :param: None
+
+        :return: None
+        """
+        # Moving entries invalidates any iterator in use
+        self._version += 1
+
+        old_buckets = self._old_buckets._data
+        stop = min(self._migrate_index + self._migrate_buckets, self._old_capacity)
+        for i in range(self._migrate_index, stop):
+            self._relink(old_buckets[i])
+            old_buckets[i] = None
+
+        self._migrate_index = stop
+        if stop == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_migration(self) -> None:
+        """
+        Completes a migration in progress, if any
+
+        :param: None
+
+        :return: None
+        """
+        while self._old_buckets is not None:
+            self._migrate()
+
+    def _find_old(self, key: str, hash: int) -> SLNode:
+        """
+        Looks for a key in the old table during a migration
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: The SLNode holding the key, or None if it is not waiting in the old table
+        """
+        if self._old_buckets is None:
+            return None
+
+        # Buckets before the migration index have already been moved
+        index = hash % self._old_capacity
+        if index < self._migrate_index or self._old_buckets[index] is None:
+            return None
+        return self._old_buckets[index].contains(key, hash)
+
+    def _find(self, key: str, hash: int) -> SLNode:
+        """
+        Finds the node for a key whose hash has already been computed, looking in the old table as well during a
+        migration
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: The SLNode holding the key, or None if the key doesn't exist
+        """
+        bucket = self._buckets._data[hash % self._capacity]
+        node = bucket.contains(key, hash) if bucket is not None else None
+
+        # Look in the old table if the key may not have migrated yet
+        if node is None:
+            node = self._find_old(key, hash)
+        return node
 
     def get(self, key: str) -> object:
         """
@@ -201,13 +450,13 @@ class HashMap:
 
         :return: An object representing the value corresponding to the found key or None if the key doesn't exist
         """
-        # Initialize hash and index
-        hash = self._hash_function(key)
-        index = hash % self.get_capacity()
+        if self._old_buckets is not None:
+            self._migrate()
 
         # Check if hashmap contains the key. Return the value if key is found
-        if self._buckets[index].contains(key):
-            return self._buckets[index].contains(key).value
+        node = self._find(key, self._hash_function(key))
+        if node is not None:
+            return node.value
 
         # Else return None
         return None
@@ -220,16 +469,10 @@ class HashMap:
 
         :return: A boolean representing if the key is found
         """
-        # Initialize hash and index
-        hash = self._hash_function(key)
-        index = hash % self.get_capacity()
-
-        # Check if key is in the hashmap
-        if self._buckets[index].contains(key):
-            return True
+        if self._old_buckets is not None:
+            self._migrate()
 
-        # Else return False
-        return False
+        return self._find(key, self._hash_function(key)) is not None
 
     def remove(self, key: str) -> None:
         """
@@ -240,15 +483,174 @@ class HashMap:
 
         :return: None
         """
-        # Initialize hash and index
-        hash = self._hash_function(key)
-        index = hash % self.get_capacity()
+        if self._old_buckets is not None:
+            self._migrate()
+
+        if self._remove_hashed(key, self._hash_function(key)):
+            self._shrink()
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """
+        Removes the node for a key whose hash has already been computed
+
+        :param key: A string representing the key to remove
+        :param hash: An integer representing the hash of the key
+
+        :return: A boolean representing if the key was found and removed
+        """
+        # Remove the key/value pair if found, dropping the bucket once it is empty and turning a sorted bucket
+        # back into a chain once it is short again
+        buckets, index = self._buckets._data, hash % self._capacity
+        if buckets[index] is not None and buckets[index].remove(key, hash):
+            if buckets[index].length() == 0:
+                buckets[index] = None
+                self._occupied -= 1
+            elif buckets[index].length() < UNTREEIFY_THRESHOLD and type(buckets[index]) is SortedBucket:
+                chain = LinkedList()
+                for node in buckets[index]:
+                    chain.insert_node(node)
+                buckets[index] = chain
+
+        # A key that has not migrated yet is removed from the old table
+        elif self._find_old(key, hash):
+            buckets, index = self._old_buckets._data, hash % self._old_capacity
+            buckets[index].remove(key, hash)
+            if buckets[index].length() == 0:
+                buckets[index] = None
+
+        # Otherwise do nothing
+        else:
+            return False
+
+        self._size -= 1
+        self._version += 1
+        return True
+
+    def _shrink(self) -> None:
+        """
+        Shrinks the table if the load has dropped below the minimum load
+
+        :param: None
+
+        :return: None
+        """
+        if self._should_shrink():
+            self._rebuild(shrink_target(self._capacity, self._size, self._min_capacity, self._min_load,
+                                        self._shrink_factor))
+
+    def put_many(self, pairs) -> None:
+        """
+        Updates or adds every key/value pair in a dynamic array. Into an empty map the table is resized once up
+        front for all the distinct keys, so none of the individual insertions has to grow it; otherwise it grows as
+        the keys are added, like put().
+        Any other iterable of pairs, such as the items() or iter_chunks() of another map, is consumed a chunk at a
+        time, so it is never copied in full.
+
+        :param pairs: A DynamicArray of (key, value) tuples, or an iterable of (key, value) tuples or of such
+        DynamicArray chunks
+
+        :return: None
+        """
+        if isinstance(pairs, DynamicArray):
+            # The underlying list is read directly to skip the bounds checks of DynamicArray
+            self._put_pairs(pairs._data)
+            return
+
+        pairs = iter(pairs)
+        first = next(pairs, None)
+        if first is None:
+            return
+
+        # Flatten chunks coming from iter_chunks() lazily, so no more than one chunk of pairs is held at a time
+        pairs = itertools.chain((first,), pairs)
+        if isinstance(first, DynamicArray):
+            pairs = itertools.chain.from_iterable(array._data for array in pairs)
+
+        chunk = list(itertools.islice(pairs, CHUNK_SIZE))
+        while chunk:
+            self._put_pairs(chunk)
+            chunk = list(itertools.islice(pairs, CHUNK_SIZE))
+
+    def _put_pairs(self, pairs: list) -> None:
+        """
+        Updates or adds every key/value pair in a list, presizing an empty table once for all of them
+
+        :param pairs: A list of (key, value) tuples
+
+        :return: None
+        """
+        # Hash every key in one pass
+        keys = [key for key, _ in pairs]
+        hashes = hash_many(self._hash_function, keys)
+
+        # Only into an empty map is every distinct key known to be new. Presizing a filled map for the whole batch
+        # would grow it even when the pairs only update existing keys, so there the usual growth is left to act.
+        if self._size == 0:
+            needed = int(len(set(keys)) / self._max_load) + 1
+            if needed > self._capacity:
+                self._rebuild(needed)
+
+        put_hashed = self._put_hashed
+        for (key, value), hash in zip(pairs, hashes):
+            put_hashed(key, value, hash)
+
+    def get_many(self, keys: DynamicArray) -> DynamicArray:
+        """
+        Finds the value of every key in a dynamic array
+
+        :param keys: A DynamicArray of keys to find
+
+        :return: A DynamicArray holding, at each index, the value of the matching key or None if it doesn't exist
+        """
+        keys = keys._data
+        hashes = hash_many(self._hash_function, keys)
+
+        values = []
+        for key, hash in zip(keys, hashes):
+            if self._old_buckets is not None:
+                self._migrate()
+            node = self._find(key, hash)
+            values.append(node.value if node is not None else None)
+        return DynamicArray(values)
+
+    def contains_many(self, keys: DynamicArray) -> DynamicArray:
+        """
+        Determines if each key in a dynamic array is in the hash table
+
+        :param keys: A DynamicArray of keys to find
+
+        :return: A DynamicArray holding, at each index, a boolean representing if the matching key is found
+        """
+        keys = keys._data
+        hashes = hash_many(self._hash_function, keys)
+
+        found = []
+        for key, hash in zip(keys, hashes):
+            if self._old_buckets is not None:
+                self._migrate()
+            found.append(self._find(key, hash) is not None)
+        return DynamicArray(found)
+
+    def remove_many(self, keys: DynamicArray) -> None:
+        """
+        Removes every key in a dynamic array from the hash map, skipping keys that don't exist. The table is
+        shrunk at most once, after all the removals.
+
+        :param keys: A DynamicArray of keys to remove
+
+        :return: None
+        """
+        keys = keys._data
+        hashes = hash_many(self._hash_function, keys)
+
+        removed = False
+        for key, hash in zip(keys, hashes):
+            if self._old_buckets is not None:
+                self._migrate()
+            removed |= self._remove_hashed(key, hash)
 
-        # Remove the key/value pair if found otherwise do nothing
-        if self._buckets[index].contains(key):
-            self._buckets[index].remove(key)
-            self._size -= 1
-        return
+        if removed:
+            self._shrink()
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -260,24 +662,227 @@ class HashMap:
         :return: A Dynamic array in which each index contains a tuple of a key/value pair
         stored in the hash map
         """
+        self._finish_migration()
+
         # Create a new Dynamic Array to return
         return_array = DynamicArray()
 
         # Add Tuples containing key value pairs to the array and return the array
         for i in range(0, self._capacity):
-            if self._buckets[i].length() != 0:
+            if self._buckets[i] is not None:
                 for j in self._buckets[i]:
                     return_array.append((j.key, j.value))
         return return_array
 
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE):
+        """
+        Streams the key/value pairs of the hash map in dynamic arrays of at most chunk_size tuples, so a large map
+        can be written out in batches without building one array of every pair
+
+        :param chunk_size: An integer representing the most pairs in each chunk
+
+        :return: A generator of DynamicArrays of (key, value) tuples
+        """
+        chunk = []
+        for item in self.items():
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield DynamicArray(chunk)
+                chunk = []
+
+        if chunk:
+            yield DynamicArray(chunk)
+
+    def __iter__(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the SLNode objects in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding SLNode objects
+        """
+        return HashMapIterator(self, 'nodes')
+
+    def keys(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the keys in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding keys
+        """
+        return HashMapIterator(self, 'keys')
+
+    def values(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the values in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding values
+        """
+        return HashMapIterator(self, 'values')
+
+    def items(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the key/value pairs in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding (key, value) tuples
+        """
+        return HashMapIterator(self, 'items')
+
+
+class HashMapIterator:
+    """
+    Separate iterator class for HashMap. Each iterator keeps its own position, so several can walk the same map
+    at once. Adding, removing or moving nodes while an iterator is in use makes it raise RuntimeError.
+    """
+
+    __slots__ = ('_map', '_buckets', '_index', '_nodes', '_version', '_view')
+
+    def __init__(self, hash_map: HashMap, view: str) -> None:
+        """
+        Initialize the iterator at the first bucket of a map
+
+        :param hash_map: The HashMap to iterate over
+        :param view: A string selecting what is yielded: 'nodes', 'keys', 'values' or 'items'
+        """
+        # Every node has to be in the current table before it can be walked
+        hash_map._finish_migration()
+
+        self._map = hash_map
+        self._buckets = hash_map._buckets._data
+        self._index = 0
+        self._nodes = None
+        self._version = hash_map._version
+        self._view = view
+
+    def __iter__(self) -> "HashMapIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> object:
+        """Skip empty buckets, then return the next node of the current chain in the selected view."""
+        if self._map._version != self._version:
+            raise RuntimeError("HashMap changed during iteration")
+
+        while True:
+            # Move on to the next non-empty bucket once the current chain is exhausted
+            node = next(self._nodes, None) if self._nodes is not None else None
+            if node is None:
+                while self._index < len(self._buckets) and self._buckets[self._index] is None:
+                    self._index += 1
+                if self._index == len(self._buckets):
+                    raise StopIteration
+                self._nodes = iter(self._buckets[self._index])
+                self._index += 1
+                continue
+
+            if self._view == 'keys':
+                return node.key
+            if self._view == 'values':
+                return node.value
+            if self._view == 'items':
+                return node.key, node.value
+            return node
+
+
+class CounterMap(HashMap):
+    """
+    Separate Chaining HashMap specialized for counting. Every value is an integer count, and each increment hashes
+    its key once and walks its chain once, instead of a get() followed by a put().
+    """
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the count of a key, starting a missing key at 0
+
+        :param key: A string representing the key being counted
+        :param delta: An integer added to the count of the key
+
+        :return: An integer representing the new count of the key
+        """
+        return self._increment(key, delta, self._hash_function(key))
+
+    def update_from(self, keys) -> None:
+        """
+        Counts every key of an iterable once. The keys are hashed a chunk at a time in one pass each.
+
+        :param keys: A DynamicArray or any other iterable of strings
+
+        :return: None
+        """
+        # The underlying list is read directly to skip the bounds checks of DynamicArray
+        if isinstance(keys, DynamicArray):
+            keys = keys._data
+
+        keys = iter(keys)
+        increment = self._increment
+        chunk = list(itertools.islice(keys, CHUNK_SIZE))
+        while chunk:
+            for key, hash in zip(chunk, hash_many(self._hash_function, chunk)):
+                increment(key, 1, hash)
+            chunk = list(itertools.islice(keys, CHUNK_SIZE))
+
+    def most_common(self, n: int = None) -> DynamicArray:
+        """
+        Finds the n keys with the highest counts. A heap of at most n counts picks them, so ranking d keys takes
+        O(d log n).
+
+        :param n: An integer representing the number of keys returned, or None to rank every key
+
+        :return: A DynamicArray of (key, count) tuples, highest count first
+        """
+        if n is None:
+            return DynamicArray(sorted(self.items(), key=lambda item: item[1], reverse=True))
+        if n <= 0:
+            return DynamicArray()
+        return DynamicArray(heapq.nlargest(n, self.items(), key=lambda item: item[1]))
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
-    TODO: Write this implementation
+    Finds every mode of a dynamic array in a single counting pass. Each element is counted in place in a
+    CounterMap, and the modes are tracked as the counts change, so the map never has to be scanned.
+
+    :param da: A DynamicArray of strings
+
+    :return: A tuple of a DynamicArray holding every mode, in the order they reached the highest frequency, and an
+    integer representing that frequency
+    """
+    # Size the map for the worst case of all distinct elements, so counting never has to resize it
+    map = CounterMap(max(da.length(), 1))
+    increment = map.increment
+
+    # Count every element, restarting the list of modes whenever one element passes the highest frequency. The
+    # underlying list is read directly to skip the bounds checks of DynamicArray.
+    modes, frequency = [], 0
+    for element in da._data:
+        count = increment(element)
+        if count > frequency:
+            modes, frequency = [element], count
+        elif count == frequency:
+            modes.append(element)
+
+    return DynamicArray(modes), frequency
+
+
+def top_k(da: DynamicArray, k: int) -> DynamicArray:
+    """
+    Finds the k most frequent elements of a dynamic array by counting them in a CounterMap
+
+    :param da: A DynamicArray of strings
+    :param k: An integer representing the number of elements returned
+
+    :return: A DynamicArray of at most k (element, frequency) tuples, most frequent first. Ties keep the order of
+    the map.
     """
-    # if you'd like to use a hash map,
-    # use this instance of your Separate Chaining HashMap
-    map = HashMap()
+    map = CounterMap(max(da.length(), 1))
+    map.update_from(da)
+    return map.most_common(k)
+
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -461,6 +1066,61 @@ if __name__ == "__main__":
     m.resize_table(2)
     print(m.get_keys_and_values())
 
+    print("\nIncremental resize example 1")
+    print("----------------------------")
+    m = HashMap(11, hash_function_1, incremental=True, migrate_buckets=1)
+    for i in range(12):
+        m.put('key' + str(i), i * 10)
+    # The last put started a migration, and only one bucket of the old table has moved so far
+    stats = m.stats()
+    print(stats['migrating'], stats['size'], stats['occupied_buckets'], m.empty_buckets(), m.get_capacity())
+    # Keys still waiting in the old table are found, updated and removed there
+    print(m.get('key0'), m.get('key5'), m.contains_key('key3'), m.get('key20'))
+    m.remove('key1')
+    m.remove('key4')
+    m.put('key3', 99)
+    print(m.get('key1'), m.get('key3'), m.get_size())
+    # Every operation moves one more bucket until the old table is gone
+    while m.stats()['migrating']:
+        m.get('key0')
+    stats = m.stats()
+    print(stats['migrating'], stats['size'], stats['occupied_buckets'], m.get_keys_and_values())
+
+    print("\nIterator example 1")
+    print("------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(4):
+        m.put('key' + str(i), i)
+    print(sorted(m.keys()), sorted(m.values()), sorted(m.items()))
+    # Every iterator keeps its own position, so two can walk the map at once
+    first, second = iter(m), iter(m)
+    print(next(first).key, next(first).key, next(second).key, len(list(second)))
+
+    print("\nIterator example 2")
+    print("------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(4):
+        m.put('key' + str(i), i)
+    # Updating the value of an existing key leaves an iterator usable
+    keys = m.keys()
+    next(keys)
+    m.put('key0', 100)
+    print(len(list(keys)), m.get('key0'))
+    # Adding or removing a key makes it fail on its next step
+    keys = m.keys()
+    next(keys)
+    m.put('key4', 4)
+    try:
+        next(keys)
+    except RuntimeError as error:
+        print('RuntimeError:', error)
+    items = m.items()
+    m.remove('key4')
+    try:
+        next(items)
+    except RuntimeError as error:
+        print('RuntimeError:', error)
+
     print("\nPDF - find_mode example 1")
     print("-----------------------------")
     da = DynamicArray(["apple", "apple", "grape", "melon", "peach"])
@@ -479,3 +1139,15 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\ntop_k example 1")
+    print("---------------")
+    da = DynamicArray(["2", "4", "2", "6", "8", "4", "1", "3", "4", "5", "7", "3", "3", "2", "6"])
+    print(f"Input: {da}\nTop 3: {top_k(da, 3)}")
+
+    print("\nCounterMap example 1")
+    print("--------------------")
+    m = CounterMap(11, hash_function_1)
+    m.update_from(DynamicArray(["red", "blue", "red", "green", "red", "blue"]))
+    print(m.increment("green", 2), m.increment("yellow"), m.get("red"))
+    print(m.most_common(2))
@@ -0,0 +1,326 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: HashMap sharded across worker processes, so bulk builds, lookups, scans and counting can use every
+# core instead of the one a single HashMap is held to by the GIL. The front end splits each batch by key hash, sends
+# every shard its part over a pipe, and only then collects the replies, so the shards work in parallel. Each shard
+# is a Separate Chaining or Open Addressing HashMap living in its own process.
+
+import heapq
+import multiprocessing
+import os
+
+from a6_include import DynamicArray
+import hash_map_oa
+import hash_map_sc
+
+
+# HashMap implementations a shard can hold
+_KINDS = {
+    'sc': hash_map_sc,
+    'oa': hash_map_oa,
+}
+
+
+def _serve(connection, kind: str, capacity: int, function, options: dict) -> None:
+    """
+    Runs one shard: answers requests arriving on a pipe until told to close. Every reply is a tuple of a success
+    flag and either the result or the exception raised.
+
+    :param connection: The worker end of the pipe to the front end
+    :param kind: A string naming the HashMap implementation, 'sc' or 'oa'
+    :param capacity: An integer representing the starting capacity of the shard
+    :param function: A hash function, or the name of one in the hash_functions registry
+    :param options: A dictionary of further keyword arguments for the HashMap
+
+    :return: None
+    """
+    module = _KINDS[kind]
+    shard = module.HashMap(capacity, function, **options)
+
+    while True:
+        command, payload = connection.recv()
+        try:
+            if command == 'close':
+                connection.send((True, None))
+                return
+            elif command == 'put_many':
+                shard.put_many(DynamicArray(payload))
+                result = None
+            elif command == 'get_many':
+                result = shard.get_many(DynamicArray(payload))._data
+            elif command == 'remove_many':
+                shard.remove_many(DynamicArray(payload))
+                result = None
+            elif command == 'size':
+                result = shard.get_size()
+            elif command == 'items':
+                result = list(shard.items())
+            elif command == 'clear':
+                shard.clear()
+                result = None
+            elif command == 'find_mode':
+                modes, frequency = hash_map_sc.find_mode(DynamicArray(payload))
+                result = modes._data, frequency
+            elif command == 'top_k':
+                elements, k = payload
+                result = hash_map_sc.top_k(DynamicArray(elements), k)._data
+            else:
+                raise ValueError(f"Unknown command '{command}'")
+            connection.send((True, result))
+        except Exception as error:
+            connection.send((False, error))
+
+
+class ShardedHashMap:
+    def __init__(self, shards: int = None, kind: str = 'sc', capacity: int = 11, function='hash_function_1',
+                 **options) -> None:
+        """
+        Initialize new HashMap split across worker processes, one per shard and by default one per core.
+        Every shard is a HashMap of the given kind, 'sc' or 'oa', built with the capacity, hash function and any
+        other options given. The hash function has to reach the workers, so it should be a registered name or a
+        module-level function rather than a lambda.
+        Keys are routed to shards with the builtin hash, which only the front end computes, so routing stays
+        consistent even though string hashing differs between processes.
+        """
+        if kind not in _KINDS:
+            raise ValueError(f"Unknown kind '{kind}', expected one of {list(_KINDS)}")
+
+        shards = shards if shards is not None else os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        self._connections = []
+        self._workers = []
+        for _ in range(shards):
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve, daemon=True,
+                                             args=(worker_connection, kind, capacity, function, options))
+            worker.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._workers.append(worker)
+
+    def __enter__(self) -> "ShardedHashMap":
+        """Return the map for use in a with statement."""
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """Stop the workers when the with statement ends."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops every worker process. The map can not be used afterwards.
+
+        :param: None
+
+        :return: None
+        """
+        if not self._workers:
+            return
+        self._broadcast('close', [None] * len(self._connections))
+        for worker in self._workers:
+            worker.join()
+        self._connections, self._workers = [], []
+
+    # ------------------------------------------------------------------ #
+
+    def _partition(self, items: list, key=None) -> list:
+        """
+        Splits a list by the shard each item's key is routed to
+
+        :param items: A list of keys, or of tuples whose first element is the key
+        :param key: None if the items are keys themselves, otherwise a function extracting the key of an item
+
+        :return: A list holding one list of items per shard
+        """
+        count = len(self._connections)
+        parts = [[] for _ in range(count)]
+        if key is None:
+            for item in items:
+                parts[hash(item) % count].append(item)
+        else:
+            for item in items:
+                parts[hash(key(item)) % count].append(item)
+        return parts
+
+    def _broadcast(self, command: str, payloads: list) -> list:
+        """
+        Sends every shard its own request and then collects the replies in shard order, so the shards all work at
+        the same time
+
+        :param command: A string naming the request
+        :param payloads: A list holding the payload for each shard
+
+        :return: A list of the results of each shard
+        """
+        for connection, payload in zip(self._connections, payloads):
+            connection.send((command, payload))
+
+        results, error = [], None
+        for connection in self._connections:
+            succeeded, result = connection.recv()
+            if not succeeded and error is None:
+                error = result
+            results.append(result)
+
+        # Every reply is collected first, so a failing shard leaves no reply behind to confuse the next request
+        if error is not None:
+            raise error
+        return results
+
+    def put_many(self, pairs: DynamicArray) -> None:
+        """
+        Updates or adds every key/value pair in a dynamic array, each shard applying its part in parallel
+
+        :param pairs: A DynamicArray of (key, value) tuples
+
+        :return: None
+        """
+        # The underlying list is read directly to skip the bounds checks of DynamicArray
+        self._broadcast('put_many', self._partition(pairs._data, key=lambda pair: pair[0]))
+
+    def get_many(self, keys: DynamicArray) -> DynamicArray:
+        """
+        Finds the value of every key in a dynamic array, each shard looking up its part in parallel
+
+        :param keys: A DynamicArray of strings
+
+        :return: A DynamicArray holding the value of each key in the same order, or None for missing keys
+        """
+        # Remember where each key came from so the answers can be put back in order
+        keys = keys._data
+        count = len(self._connections)
+        parts = [[] for _ in range(count)]
+        positions = [[] for _ in range(count)]
+        for position, key in enumerate(keys):
+            shard = hash(key) % count
+            parts[shard].append(key)
+            positions[shard].append(position)
+
+        values = [None] * len(keys)
+        for shard_positions, shard_values in zip(positions, self._broadcast('get_many', parts)):
+            for position, value in zip(shard_positions, shard_values):
+                values[position] = value
+        return DynamicArray(values)
+
+    def remove_many(self, keys: DynamicArray) -> None:
+        """
+        Removes every key in a dynamic array, each shard removing its part in parallel
+
+        :param keys: A DynamicArray of strings
+
+        :return: None
+        """
+        self._broadcast('remove_many', self._partition(keys._data))
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates or adds one key/value pair. Every call is a round trip to a worker, so batches should use put_many().
+
+        :param key: A string representing the key in the key value pair
+        :param value: An object representing the object in the key value pair
+
+        :return: None
+        """
+        self.put_many(DynamicArray([(key, value)]))
+
+    def get(self, key: str) -> object:
+        """
+        Finds the value of one key. Every call is a round trip to a worker, so batches should use get_many().
+
+        :param key: A string representing the key to find in the hash table
+
+        :return: An object representing the value corresponding to the found key or None if the key doesn't exist
+        """
+        return self.get_many(DynamicArray([key]))[0]
+
+    def remove(self, key: str) -> None:
+        """
+        Removes one key. Every call is a round trip to a worker, so batches should use remove_many().
+
+        :param key: A string representing the key to remove
+
+        :return: None
+        """
+        self.remove_many(DynamicArray([key]))
+
+    def get_size(self) -> int:
+        """
+        Return size of map, the sizes of every shard together
+        """
+        return sum(self._broadcast('size', [None] * len(self._connections)))
+
+    def clear(self) -> None:
+        """
+        Clears the contents of every shard while maintaining their capacities.
+
+        :param: None
+
+        :return: None
+        """
+        self._broadcast('clear', [None] * len(self._connections))
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map, every shard scanning its part in parallel
+
+        :param: None
+
+        :return: A Dynamic array in which each index contains a tuple of a key/value pair
+        stored in the hash map
+        """
+        return DynamicArray([item for items in self._broadcast('items', [None] * len(self._connections))
+                             for item in items])
+
+    def find_mode(self, da: DynamicArray) -> (DynamicArray, int):
+        """
+        Finds every mode of a dynamic array, counting it in parallel. Equal elements are routed to the same shard,
+        so each shard's counts are final and only the shards' own modes need merging.
+
+        :param da: A DynamicArray of strings
+
+        :return: A tuple of a DynamicArray holding every mode and an integer representing their frequency
+        """
+        results = self._broadcast('find_mode', self._partition(da._data))
+        frequency = max(shard_frequency for _, shard_frequency in results)
+        modes = [mode for shard_modes, shard_frequency in results if shard_frequency == frequency
+                 for mode in shard_modes]
+        return DynamicArray(modes if frequency > 0 else []), frequency
+
+    def top_k(self, da: DynamicArray, k: int) -> DynamicArray:
+        """
+        Finds the k most frequent elements of a dynamic array, counting it in parallel. Each shard ranks its own
+        elements, and the k heaviest of all the shards' candidates are kept.
+
+        :param da: A DynamicArray of strings
+        :param k: An integer representing the number of elements returned
+
+        :return: A DynamicArray of at most k (element, frequency) tuples, most frequent first
+        """
+        parts = self._partition(da._data)
+        results = self._broadcast('top_k', [(part, k) for part in parts])
+        candidates = [item for result in results for item in result]
+        return DynamicArray(heapq.nlargest(k, candidates, key=lambda item: item[1]))
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput_many, get_many and remove_many across shards")
+    print("------------------------------------------------")
+    with ShardedHashMap(shards=3, kind='oa', function='fnv1a') as m:
+        m.put_many(DynamicArray([('key' + str(i), i) for i in range(1000)]))
+        print(m.get_size(), m.get_many(DynamicArray(['key1', 'key999', 'absent'])))
+        m.remove_many(DynamicArray(['key' + str(i) for i in range(500)]))
+        print(m.get_size(), m.get('key1'), m.get('key999'))
+
+    print("\nfind_mode and top_k across shards")
+    print("---------------------------------")
+    with ShardedHashMap(shards=3) as m:
+        da = DynamicArray(["2", "4", "2", "6", "8", "4", "1", "3", "4", "5", "7", "3", "3", "2", "6"])
+        mode, frequency = m.find_mode(da)
+        print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}")
+        print(f"Top 2: {m.top_k(da, 2)}")
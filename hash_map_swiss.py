@@ -0,0 +1,506 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: HashMap in the style of a Swiss table, an alternative to the quadratic probing map in hash_map_oa for
+# miss-heavy workloads. Every bucket has a control byte in one bytearray: empty, deleted, or the low 7 bits of the
+# hash of its key. Probing scans a whole group of buckets at once by searching the control bytes, and only looks at
+# the keys, held in parallel lists, where a control byte matches. A miss usually touches no key at all.
+
+from a6_include import DynamicArray, HashEntry, hash_function_1, hash_function_2
+from capacity_policy import check_load_limits, mix_hash, next_power_of_two, shrink_target
+from hash_functions import get_hash_function
+
+
+# Number of buckets scanned together; the capacity is always a power of two and a multiple of it
+GROUP_SIZE = 16
+
+# Control bytes. A bucket holding a key stores the 7-bit fragment of its hash, which never has the high bit set.
+EMPTY = 0x80
+DELETED = 0xFE
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_load: float = 0.875, min_load: float = 0.1,
+                 grow_factor: float = 2.0, shrink_factor: float = 2.0) -> None:
+        """
+        Initialize new HashMap that uses
+        group probing over control bytes for collision resolution.
+        The hash function may be given directly or by its name in the hash_functions registry.
+        The table grows by grow_factor once the load reaches max_load and shrinks by shrink_factor once the load
+        drops below min_load, but never below the starting capacity. Capacities are powers of two of at least
+        GROUP_SIZE.
+        """
+        check_load_limits(max_load, min_load, grow_factor, shrink_factor, below_one=True)
+
+        self._capacity = self._round_capacity(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = get_hash_function(function)
+        self._size = 0
+
+        # Changes whenever entries are added, removed or moved, so iterators can detect it
+        self._version = 0
+
+        # Resize policy
+        self._max_load = max_load
+        self._min_load = min_load
+        self._grow_factor = grow_factor
+        self._shrink_factor = shrink_factor
+        self._min_capacity = self._capacity
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            entry = None
+            if self._control[i] < EMPTY:
+                entry = HashEntry(self._keys[i], self._values[i])
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    @staticmethod
+    def _round_capacity(capacity: int) -> int:
+        """
+        Rounds a capacity up to a power of two of at least GROUP_SIZE
+
+        :param capacity: An integer representing the desired capacity
+
+        :return: An integer representing the capacity to use
+        """
+        return max(GROUP_SIZE, next_power_of_two(capacity))
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the control bytes and the parallel lists of keys, values and hashes with empty ones
+
+        :param capacity: An integer representing the number of buckets
+
+        :return: None
+        """
+        self._control = bytearray([EMPTY]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [None] * capacity
+        self._deleted = 0
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Walks the probe sequence for a key a group at a time, in triangular steps over the groups. Within a group
+        only the buckets whose control byte matches the hash fragment of the key are compared, and the walk stops at
+        the first group with an empty bucket, since an insert would have used it.
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: An integer representing the index holding the key, or -1 if the key doesn't exist
+        """
+        mixed = mix_hash(hash)
+        fragment = mixed & 0x7F
+        group_mask = (self._capacity // GROUP_SIZE) - 1
+        group = (mixed >> 7) & group_mask
+        control = self._control
+
+        for step in range(1, group_mask + 2):
+            start = group * GROUP_SIZE
+            end = start + GROUP_SIZE
+
+            # Compare only the buckets whose control byte holds the fragment of the key
+            index = control.find(fragment, start, end)
+            while index != -1:
+                if self._hashes[index] == hash and self._keys[index] == key:
+                    return index
+                index = control.find(fragment, index + 1, end)
+
+            if control.find(EMPTY, start, end) != -1:
+                return -1
+            group = (group + step) & group_mask
+
+        return -1
+
+    def _probe(self, key: str, hash: int) -> (int, int):
+        """
+        Walks the probe sequence for a key like _find(), also noting the first bucket an insert could use
+
+        :param key: A string representing the key to find
+        :param hash: An integer representing the hash of the key
+
+        :return: A tuple of the index holding the key (or -1 if absent) and the first index where the key could be
+        inserted (or -1 if the probe sequence has no free bucket)
+        """
+        mixed = mix_hash(hash)
+        fragment = mixed & 0x7F
+        group_mask = (self._capacity // GROUP_SIZE) - 1
+        group = (mixed >> 7) & group_mask
+        control, hashes, keys = self._control, self._hashes, self._keys
+        free = -1
+
+        for step in range(1, group_mask + 2):
+            start = group * GROUP_SIZE
+            end = start + GROUP_SIZE
+
+            # Compare only the buckets whose control byte holds the fragment of the key
+            index = control.find(fragment, start, end)
+            while index != -1:
+                if hashes[index] == hash and keys[index] == key:
+                    return index, free
+                index = control.find(fragment, index + 1, end)
+
+            # A group with an empty bucket ends the probe sequence. Either an empty or a deleted bucket can take an
+            # insert, whichever comes first.
+            empty = control.find(EMPTY, start, end)
+            if free == -1:
+                deleted = control.find(DELETED, start, end)
+                if deleted != -1 and (empty == -1 or deleted < empty):
+                    free = deleted
+                elif empty != -1:
+                    free = empty
+            if empty != -1:
+                return -1, free
+
+            group = (group + step) & group_mask
+
+        return -1, free
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the key exists it updates the value, otherwise it adds a new
+        key/value pair
+
+        :param key: A string representing the key in the key value pair
+        :param value: An object representing the object in the key value pair
+
+        :return: None
+        """
+        # Grow the table if adding a key would take the load past the maximum load. Deleted buckets also lengthen
+        # probe sequences, so once they make up the difference the table is rebuilt at its current capacity.
+        if self._size + 1 > self._max_load * self._capacity:
+            self._resize(int(self._grow_factor * self._capacity))
+        elif self._size + self._deleted + 1 > self._max_load * self._capacity:
+            self._resize(self._capacity)
+
+        hash = self._hash_function(key)
+        index, free = self._probe(key, hash)
+
+        # Check if the table contains the key. If so update the value.
+        if index != -1:
+            self._values[index] = value
+            return
+
+        # Otherwise add a new key/value pair and increment the size
+        if self._control[free] == DELETED:
+            self._deleted -= 1
+        self._control[free] = mix_hash(hash) & 0x7F
+        self._keys[free] = key
+        self._values[free] = value
+        self._hashes[free] = hash
+        self._size += 1
+        self._version += 1
+
+    def table_load(self) -> float:
+        """
+        Calculates the current hash table load factor.
+
+        :param: None
+
+        :return: A float representing the table load factor.
+        """
+        # Use 𝝺 = n/m to calculate load
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Finds the number of empty buckets in the hash table, not counting deleted ones
+
+        :param: None
+
+        :return: An integer representing the number of empty buckets in the table
+        """
+        return self._capacity - self._size - self._deleted
+
+    def stats(self) -> dict:
+        """
+        Reports the occupancy counters of the hash table
+
+        :param: None
+
+        :return: A dictionary of the size, capacity, load factor, empty buckets and deleted buckets of the table
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'tombstones': self._deleted,
+        }
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table while maintaining and rehashing the existing key/value pairs
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        # Do nothing if the desired capacity is less than the table size
+        if new_capacity < self._size:
+            return
+
+        self._resize(new_capacity)
+
+        # An explicitly requested capacity becomes the floor for automatic shrinking
+        self._min_capacity = self._capacity
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Rebuilds the hash table at a new capacity in a single call, discarding every deleted bucket
+
+        :param new_capacity: An integer representing desired capacity for the hash table
+
+        :return: None
+        """
+        self._version += 1
+        control, keys, values, hashes = self._control, self._keys, self._values, self._hashes
+
+        # Round the capacity up to a power of two, growing it until the entries fit under the maximum load
+        new_capacity = self._round_capacity(new_capacity)
+        while self._size > self._max_load * new_capacity:
+            new_capacity = self._round_capacity(int(self._grow_factor * new_capacity))
+
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+
+        # Place the existing entries using their cached hashes. Keys are known to be unique, so no key is compared.
+        for index in range(len(control)):
+            if control[index] < EMPTY:
+                self._place(keys[index], values[index], hashes[index])
+
+    def _place(self, key: str, value: object, hash: int) -> None:
+        """
+        Puts a key known not to be in the table into the first empty bucket of its probe sequence
+
+        :param key: A string representing the key in the key value pair
+        :param value: An object representing the object in the key value pair
+        :param hash: An integer representing the hash of the key
+
+        :return: None
+        """
+        mixed = mix_hash(hash)
+        group_mask = (self._capacity // GROUP_SIZE) - 1
+        group = (mixed >> 7) & group_mask
+        control = self._control
+
+        step = 1
+        index = control.find(EMPTY, group * GROUP_SIZE, group * GROUP_SIZE + GROUP_SIZE)
+        while index == -1:
+            group = (group + step) & group_mask
+            step += 1
+            index = control.find(EMPTY, group * GROUP_SIZE, group * GROUP_SIZE + GROUP_SIZE)
+
+        control[index] = mixed & 0x7F
+        self._keys[index] = key
+        self._values[index] = value
+        self._hashes[index] = hash
+
+    def get(self, key: str) -> object:
+        """
+        Finds the value in the hash table when passed a key
+
+        :param key: A string representing the key to find in the hash table
+
+        :return: An object representing the value corresponding to the found key or None if the key doesn't exist
+        """
+        index = self._find(key, self._hash_function(key))
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Determines is a given key is in the hash table
+
+        :param key: A string representing the key to find
+
+        :return: A boolean representing if the key is found
+        """
+        return self._find(key, self._hash_function(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map,
+        otherwise does nothing if the key doesn't exist.
+
+        :param key: A string representing the key to find
+
+        :return: None
+        """
+        index = self._find(key, self._hash_function(key))
+        if index == -1:
+            return
+
+        # A group that still has an empty bucket was never full, so no probe sequence runs past it and the bucket
+        # can be emptied. Otherwise it is marked deleted, so later probes keep going.
+        start = index - index % GROUP_SIZE
+        if self._control.find(EMPTY, start, start + GROUP_SIZE) != -1:
+            self._control[index] = EMPTY
+        else:
+            self._control[index] = DELETED
+            self._deleted += 1
+        self._keys[index] = self._values[index] = self._hashes[index] = None
+
+        self._size -= 1
+        self._version += 1
+
+        # Shrink the table once the load drops below the minimum load
+        if self._capacity > self._min_capacity and self.table_load() < self._min_load:
+            self._resize(shrink_target(self._capacity, self._size, self._min_capacity, self._min_load,
+                                       self._shrink_factor))
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map while maintaining the capacity.
+
+        :param: None
+
+        :return: None
+        """
+        self._version += 1
+        self._allocate(self._capacity)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a key/value pair
+        stored in the hash map
+
+        :param: None
+
+        :return: A Dynamic array in which each index contains a tuple of a key/value pair
+        stored in the hash map
+        """
+        return DynamicArray(list(self.items()))
+
+    def __iter__(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the entries in the hash map, each built as a HashEntry
+
+        :param: None
+
+        :return: A HashMapIterator yielding HashEntry objects
+        """
+        return HashMapIterator(self, 'entries')
+
+    def keys(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the keys in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding keys
+        """
+        return HashMapIterator(self, 'keys')
+
+    def values(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the values in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding values
+        """
+        return HashMapIterator(self, 'values')
+
+    def items(self) -> "HashMapIterator":
+        """
+        Returns an iterator over the key/value pairs in the hash map
+
+        :param: None
+
+        :return: A HashMapIterator yielding (key, value) tuples
+        """
+        return HashMapIterator(self, 'items')
+
+
+class HashMapIterator:
+    """
+    Separate iterator class for HashMap. Each iterator keeps its own position, so several can walk the same map
+    at once. Adding, removing or moving entries while an iterator is in use makes it raise RuntimeError.
+    """
+
+    __slots__ = ('_map', '_index', '_version', '_view')
+
+    def __init__(self, hash_map: HashMap, view: str) -> None:
+        """
+        Initialize the iterator at the first bucket of a map
+
+        :param hash_map: The HashMap to iterate over
+        :param view: A string selecting what is yielded: 'entries', 'keys', 'values' or 'items'
+        """
+        self._map = hash_map
+        self._index = 0
+        self._version = hash_map._version
+        self._view = view
+
+    def __iter__(self) -> "HashMapIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> object:
+        """Skip empty and deleted buckets, then return the next entry in the selected view."""
+        hash_map = self._map
+        if hash_map._version != self._version:
+            raise RuntimeError("HashMap changed during iteration")
+
+        # Only buckets holding a key have a control byte below EMPTY
+        control = hash_map._control
+        index = self._index
+        while index < len(control) and control[index] >= EMPTY:
+            index += 1
+        if index == len(control):
+            self._index = index
+            raise StopIteration
+        self._index = index + 1
+
+        if self._view == 'keys':
+            return hash_map._keys[index]
+        if self._view == 'values':
+            return hash_map._values[index]
+        if self._view == 'items':
+            return hash_map._keys[index], hash_map._values[index]
+        return HashEntry(hash_map._keys[index], hash_map._values[index], hash_map._hashes[index])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput, get and remove")
+    print("-------------------")
+    m = HashMap(16, hash_function_1)
+    for i in range(40):
+        m.put('str' + str(i), i * 100)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2), m.get('str7'), m.contains_key('str40'))
+    for i in range(0, 40, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.get('str7'), m.get('str8'), m.stats()['tombstones'])
+
+    print("\nIteration")
+    print("---------")
+    m = HashMap(16, hash_function_2)
+    for i in range(5):
+        m.put(str(i), i * 10)
+    print(sorted(m.items()))
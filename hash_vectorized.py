@@ -0,0 +1,169 @@
+# Course: CS261 - Data Structures
+# Assignment: 6
+# Description: Vectorized versions of hash_function_1 and hash_function_2 that hash a whole batch of keys at once
+# with NumPy. The results are identical to the scalar functions, so tables built either way stay compatible.
+# NumPy is optional; without it every function falls back to calling the scalar hash function once per key. It is
+# only imported by the first batch hashed, so importing a HashMap for single puts does not pay to load it.
+
+from a6_include import hash_function_1, hash_function_2
+
+# NumPy module, None if it is not installed, or False until the first batch has tried to import it
+np = False
+
+
+# Keys are encoded this many at a time
+CHUNK_SIZE = 16384
+
+# Keys longer than this are hashed by the scalar function, so every row of a chunk is padded to at most this many
+# code points and a chunk never takes more than CHUNK_SIZE * MAX_VECTOR_LENGTH * 4 bytes (4 MB)
+MAX_VECTOR_LENGTH = 64
+
+
+def _load_numpy():
+    """
+    Imports NumPy the first time it is needed
+
+    :param: None
+
+    :return: The numpy module, or None if it is not installed
+    """
+    global np
+    if np is False:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+
+def _code_points(keys: list) -> "np.ndarray":
+    """
+    Encodes a list of keys into a matrix of Unicode code points, one row per key, padded on the right with zeros
+
+    :param keys: A list of strings
+
+    :return: A 2-D uint32 NumPy array with one row per key
+    """
+    encoded = np.array(keys, dtype=str)
+    width = encoded.itemsize // 4
+    if width == 0:
+        return np.zeros((len(keys), 0), dtype=np.uint32)
+    return encoded.view(np.uint32).reshape(len(keys), width)
+
+
+def _hash_chunks(keys: list, scalar, hash_points) -> list:
+    """
+    Hashes a list of keys a chunk at a time, encoding each chunk as a matrix of code points. Keys longer than
+    MAX_VECTOR_LENGTH are left out of the matrix and hashed by the scalar function instead, so one long key can not
+    pad every other row of its chunk.
+
+    :param keys: A list of strings
+    :param scalar: The scalar hash function, used for the long keys
+    :param hash_points: A function hashing every row of a code point matrix into a NumPy int64 array
+
+    :return: A list of integers holding the hash of each key
+    """
+    hashes = []
+    for start in range(0, len(keys), CHUNK_SIZE):
+        chunk = keys[start:start + CHUNK_SIZE]
+        lengths = list(map(len, chunk))
+        if max(lengths, default=0) <= MAX_VECTOR_LENGTH:
+            hashes.extend(hash_points(_code_points(chunk)).tolist())
+            continue
+
+        # Blank out the long keys for the matrix, then hash them one at a time
+        long_keys = [i for i, length in enumerate(lengths) if length > MAX_VECTOR_LENGTH]
+        short_chunk = list(chunk)
+        for i in long_keys:
+            short_chunk[i] = ''
+        chunk_hashes = hash_points(_code_points(short_chunk)).tolist()
+        for i in long_keys:
+            chunk_hashes[i] = scalar(chunk[i])
+        hashes.extend(chunk_hashes)
+    return hashes
+
+
+def _sum_points(points: "np.ndarray") -> "np.ndarray":
+    """
+    Sums every row of a code point matrix, as hash_function_1 does
+
+    :param points: A 2-D uint32 NumPy array with one row per key
+
+    :return: A 1-D int64 NumPy array holding the hash of each row
+    """
+    return points.sum(axis=1, dtype=np.int64)
+
+
+def _weighted_sum_points(points: "np.ndarray") -> "np.ndarray":
+    """
+    Sums every row of a code point matrix weighted by 1-based column position, as hash_function_2 does. The columns
+    are added one at a time, so only a single column is ever widened to int64 rather than the whole matrix.
+
+    :param points: A 2-D uint32 NumPy array with one row per key
+
+    :return: A 1-D int64 NumPy array holding the hash of each row
+    """
+    hashes = np.zeros(points.shape[0], dtype=np.int64)
+    for column in range(points.shape[1]):
+        hashes += points[:, column].astype(np.int64) * (column + 1)
+    return hashes
+
+
+def hash_function_1_many(keys: list) -> list:
+    """
+    Hashes every key with hash_function_1, the sum of its code points
+
+    :param keys: A list of strings
+
+    :return: A list of integers holding the hash of each key
+    """
+    if _load_numpy() is None:
+        return [hash_function_1(key) for key in keys]
+    return _hash_chunks(keys, hash_function_1, _sum_points)
+
+
+def hash_function_2_many(keys: list) -> list:
+    """
+    Hashes every key with hash_function_2, the sum of its code points weighted by their 1-based position
+
+    :param keys: A list of strings
+
+    :return: A list of integers holding the hash of each key
+    """
+    if _load_numpy() is None:
+        return [hash_function_2(key) for key in keys]
+    return _hash_chunks(keys, hash_function_2, _weighted_sum_points)
+
+
+# Scalar hash functions that have a vectorized counterpart
+_VECTORIZED = {
+    hash_function_1: hash_function_1_many,
+    hash_function_2: hash_function_2_many,
+}
+
+
+def hash_many(function, keys: list) -> list:
+    """
+    Hashes every key with the given hash function, using its vectorized counterpart when there is one
+
+    :param function: A hash function taking a single key
+    :param keys: A list of strings
+
+    :return: A list of integers holding the hash of each key
+    """
+    if function in _VECTORIZED:
+        return _VECTORIZED[function](keys)
+    return [function(key) for key in keys]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nVectorized hashes match the scalar functions")
+    print("--------------------------------------------")
+    keys = ['', 'a', 'str12', 'str21', 'key' + str(10 ** 20), 'ünïcødé', '\U0001F600 emoji', 'long' * 500]
+    print(hash_function_1_many(keys) == [hash_function_1(key) for key in keys])
+    print(hash_function_2_many(keys) == [hash_function_2(key) for key in keys])
+    print(hash_many(len, keys))